@@ -1,6 +1,7 @@
 """
 Frontend routes for serving HTML pages with HTMX integration
 """
+import logging
 import uuid
 from typing import Optional
 from fastapi import APIRouter, Depends, Request, HTTPException, status
@@ -16,6 +17,7 @@ from app.core.database import get_supabase_client
 
 router = APIRouter(tags=["frontend"])
 templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
 
 
 async def get_services():
@@ -58,20 +60,19 @@ async def dashboard(
     user_id = uuid.UUID(current_user["id"])
     
     try:
-        # Get overview statistics
-        stats = await services["stats_service"].get_user_overview_stats(user_id)
+        # Get overview statistics, per-deck statistics and progress data for chart (last 7 days)
+        dashboard_data = await services["stats_service"].get_dashboard(user_id, days=7)
+        stats = dashboard_data["overview"]
+        progress_data = dashboard_data["progress"]
         
         # Get recent decks (limit to 5)
         recent_decks = await services["deck_service"].get_user_decks(user_id)
         recent_decks = recent_decks[:5]  # Limit to 5 most recent
         
-        # Get progress data for chart (last 7 days)
-        progress_data = await services["stats_service"].get_learning_progress_over_time(user_id, days=7)
-        
         # Add progress percentage to decks
+        deck_progress = {deck_stats.deck_id: deck_stats.study_progress_percentage for deck_stats in dashboard_data["decks"]}
         for deck in recent_decks:
-            deck_stats = await services["stats_service"].get_deck_statistics(user_id, deck.id)
-            deck.progress_percentage = deck_stats.study_progress_percentage if deck_stats else 0.0
+            deck.progress_percentage = deck_progress.get(str(deck.id), 0.0)
         
         return templates.TemplateResponse("dashboard.html", {
             "request": request,
@@ -81,8 +82,8 @@ async def dashboard(
             "progress_data": progress_data
         })
         
-    except Exception as e:
-        print(f"Error loading dashboard: {e}")
+    except Exception:
+        logger.exception("Error loading dashboard")
         return templates.TemplateResponse("error.html", {
             "request": request,
             "current_user": current_user,
@@ -106,7 +107,7 @@ async def decks_list(
         # Add statistics to each deck
         decks_with_stats = []
         for deck in decks:
-            deck_stats = await services["stats_service"].get_deck_statistics(user_id, deck.id)
+            deck_stats = await services["stats_service"].get_deck_statistics(user_id, deck.id, deck_data=deck.model_dump(mode="json"))
             deck_data = {
                 "deck": deck,
                 "stats": deck_stats
@@ -119,8 +120,8 @@ async def decks_list(
             "decks": decks_with_stats
         })
         
-    except Exception as e:
-        print(f"Error loading decks: {e}")
+    except Exception:
+        logger.exception("Error loading decks")
         return templates.TemplateResponse("error.html", {
             "request": request,
             "current_user": current_user,
@@ -171,8 +172,8 @@ async def deck_detail(
         
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error loading deck detail: {e}")
+    except Exception:
+        logger.exception("Error loading deck detail")
         return templates.TemplateResponse("error.html", {
             "request": request,
             "current_user": current_user,
@@ -197,7 +198,7 @@ async def study_selection(
         study_ready_decks = []
         for deck in decks:
             if deck.card_count > 0:  # Only decks with cards
-                deck_stats = await services["stats_service"].get_deck_statistics(user_id, deck.id)
+                deck_stats = await services["stats_service"].get_deck_statistics(user_id, deck.id, deck_data=deck.model_dump(mode="json"))
                 study_ready_decks.append({
                     "deck": deck,
                     "stats": deck_stats
@@ -209,8 +210,8 @@ async def study_selection(
             "decks": study_ready_decks
         })
         
-    except Exception as e:
-        print(f"Error loading study selection: {e}")
+    except Exception:
+        logger.exception("Error loading study selection")
         return templates.TemplateResponse("error.html", {
             "request": request,
             "current_user": current_user,
@@ -296,8 +297,8 @@ async def start_study_session(
         
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error starting study session: {e}")
+    except Exception:
+        logger.exception("Error starting study session")
         return templates.TemplateResponse("error.html", {
             "request": request,
             "current_user": current_user,
@@ -316,10 +317,11 @@ async def statistics_page(
     
     try:
         # Get comprehensive statistics
-        overview_stats = await services["stats_service"].get_user_overview_stats(user_id)
-        deck_stats = await services["stats_service"].get_all_deck_statistics(user_id)
+        dashboard_data = await services["stats_service"].get_dashboard(user_id, days=30)
+        overview_stats = dashboard_data["overview"]
+        deck_stats = dashboard_data["decks"]
+        progress_data = dashboard_data["progress"]
         difficult_cards = await services["stats_service"].get_difficult_cards(user_id, limit=20)
-        progress_data = await services["stats_service"].get_learning_progress_over_time(user_id, days=30)
         
         return templates.TemplateResponse("statistics.html", {
             "request": request,
@@ -330,8 +332,8 @@ async def statistics_page(
             "progress_data": progress_data
         })
         
-    except Exception as e:
-        print(f"Error loading statistics: {e}")
+    except Exception:
+        logger.exception("Error loading statistics")
         return templates.TemplateResponse("error.html", {
             "request": request,
             "current_user": current_user,
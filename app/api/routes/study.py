@@ -3,9 +3,9 @@ Study session API routes
 """
 import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 
-from app.services.study_service import StudySessionService
+from app.services.study_service import StudySessionService, MAX_INTERACTION_BATCH_SIZE
 from app.services.deck_service import DeckService
 from app.auth.dependencies import get_current_active_user
 from app.core.database import get_supabase_client
@@ -101,11 +101,18 @@ async def update_study_session(
 ):
     """Update study session progress"""
     
-    session = await study_service.update_study_session(
-        session_id=session_id,
-        user_id=uuid.UUID(current_user["id"]),
-        session_update=session_update
-    )
+    if session_update.dict(exclude_unset=True):
+        session = await study_service.update_study_session(
+            session_id=session_id,
+            user_id=uuid.UUID(current_user["id"]),
+            session_update=session_update
+        )
+    else:
+        # Empty update: return the session as it is
+        session = await study_service.get_study_session(
+            session_id=session_id,
+            user_id=uuid.UUID(current_user["id"])
+        )
     
     if not session:
         raise HTTPException(
@@ -180,6 +187,28 @@ async def record_card_interaction(
     return result
 
 
+@router.post("/interactions/batch", response_model=List[CardInteractionResponse], status_code=status.HTTP_201_CREATED)
+async def record_card_interactions(
+    interactions: List[CardInteractionCreate] = Body(..., max_length=MAX_INTERACTION_BATCH_SIZE),
+    current_user: dict = Depends(get_current_active_user),
+    study_service: StudySessionService = Depends(get_study_service)
+):
+    """Record several card interactions buffered by the client in one request"""
+    
+    results = await study_service.record_card_interactions(
+        interactions=interactions,
+        user_id=uuid.UUID(current_user["id"])
+    )
+    
+    if interactions and not results:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not record interactions"
+        )
+    
+    return results
+
+
 @router.get("/sessions/{session_id}/quiz/{card_id}", response_model=QuizQuestionResponse)
 async def get_quiz_question(
     session_id: uuid.UUID,
@@ -2,6 +2,7 @@
 Authentication utilities using Supabase Auth
 """
 from datetime import datetime, timedelta
+import logging
 from typing import Optional
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -13,6 +14,7 @@ from app.core.config import get_settings
 from app.schemas.schemas import TokenData
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -68,11 +70,12 @@ class AuthService:
                         "supabase_user_id": auth_response.user.id
                     }
             except Exception as e:
-                print(f"Supabase auth error: {e}")
+                # Wrong passwords land here too, so skip the traceback
+                logger.warning("Supabase sign-in failed for %s: %s", username, e)
                 return None
                 
-        except Exception as e:
-            print(f"Authentication error: {e}")
+        except Exception:
+            logger.exception("Authentication error")
             return None
     
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -144,12 +147,12 @@ class AuthService:
                 stats_data = {
                     "user_id": response.data[0]["id"]
                 }
-                self.supabase.table("user_statistics").insert(stats_data).execute()
+                self.supabase.table("user_statistics").insert(stats_data, returning="minimal").execute()
                 
                 return response.data[0]
                 
-        except Exception as e:
-            print(f"Registration error: {e}")
+        except Exception:
+            logger.exception("Registration error")
             return None
     
     async def logout_user(self) -> bool:
@@ -157,6 +160,6 @@ class AuthService:
         try:
             self.supabase.auth.sign_out()
             return True
-        except Exception as e:
-            print(f"Logout error: {e}")
+        except Exception:
+            logger.exception("Logout error")
             return False
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+In-process TTL caches for read-heavy Supabase lookups
+"""
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire a fixed number of seconds after being set"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return default
+
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value for the configured TTL"""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            self._evict()
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key, returning its value if it was cached"""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def pop_prefix(self, prefix: Tuple[Hashable, ...]) -> None:
+        """Remove every tuple key that starts with the given prefix"""
+        size = len(prefix)
+        for key in [key for key in self._entries if isinstance(key, tuple) and key[:size] == prefix]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest one if still full"""
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            self._entries.pop(key, None)
+
+        if len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)), None)
+
+
+# Card IDs per deck, used by the study card scheduler; invalidated when cards are added or removed
+deck_card_ids_cache = TTLCache(ttl=60)
+
+# Full card lists per deck, used for quiz distractors; invalidated when cards are added, edited or removed
+deck_cards_cache = TTLCache(ttl=300)
+
+# Per-user statistics keyed by (user_id, kind, ...); invalidated when the user's statistics are updated
+statistics_cache = TTLCache(ttl=30, maxsize=10_000)
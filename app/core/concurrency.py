@@ -0,0 +1,27 @@
+"""
+Helpers for running blocking Supabase queries concurrently
+"""
+import asyncio
+from typing import Any, Iterable, List
+
+# Upper bound on in-flight Supabase requests for a single fan-out
+DEFAULT_QUERY_CONCURRENCY = 10
+
+
+async def run_query(query: Any) -> Any:
+    """Execute a Supabase query builder in a worker thread"""
+    return await asyncio.to_thread(query.execute)
+
+
+async def gather_queries(
+    queries: Iterable[Any],
+    limit: int = DEFAULT_QUERY_CONCURRENCY
+) -> List[Any]:
+    """Execute Supabase query builders concurrently, preserving order"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _execute(query: Any) -> Any:
+        async with semaphore:
+            return await run_query(query)
+
+    return await asyncio.gather(*(_execute(query) for query in queries))
@@ -15,6 +15,11 @@ class Settings(BaseSettings):
     supabase_service_key: str
     supabase_anon_key: str
     
+    # Supabase HTTP connection pool
+    supabase_max_connections: int = 50
+    supabase_max_keepalive_connections: int = 20
+    supabase_timeout_seconds: float = 10.0
+    
     # Database Configuration
     database_url: Optional[str] = None
     
@@ -26,6 +31,7 @@ class Settings(BaseSettings):
     # Application
     environment: str = "development"
     debug: bool = False
+    log_level: str = "INFO"
     
     # CORS
     allowed_origins: List[str] = ["http://localhost:3000", "http://localhost:8080"]
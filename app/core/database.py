@@ -2,11 +2,12 @@
 Database connection and session management
 """
 import os
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Optional
+import httpx
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
-from supabase import create_client, Client
+from supabase import Client
 
 from app.core.config import get_settings
 from app.models.database import Base
@@ -70,11 +71,48 @@ SessionLocal = sessionmaker(
     bind=sync_engine
 )
 
-# Supabase client
-supabase_client: Client = create_client(
-    settings.supabase_url,
-    settings.supabase_anon_key
-)
+
+class PooledSupabaseClient(Client):
+    """
+    Supabase client whose PostgREST requests go through a dedicated pooled httpx client.
+    
+    postgrest's create_session rewrites base_url and headers on whatever client it is
+    given, so the pool must not be shared with auth, storage or functions (which is what
+    ClientOptions(httpx_client=...) would do). Overriding the factory rather than setting
+    _postgrest once keeps the pool when the client rebuilds PostgREST after an auth change.
+    """
+    
+    def __init__(self, supabase_url: str, supabase_key: str, http_client: httpx.Client):
+        self.postgrest_http_client = http_client
+        super().__init__(supabase_url, supabase_key)
+    
+    def _init_postgrest_client(self, rest_url: str, headers: Dict[str, str], schema: str, **kwargs):
+        return Client._init_postgrest_client(
+            rest_url, headers, schema, http_client=self.postgrest_http_client
+        )
+
+
+# Created by open_supabase() in the app lifespan and discarded by close_db()
+supabase_client: Optional[PooledSupabaseClient] = None
+
+
+def open_supabase() -> PooledSupabaseClient:
+    """Create the Supabase client and its PostgREST connection pool"""
+    global supabase_client
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+            max_connections=settings.supabase_max_connections
+        ),
+        timeout=settings.supabase_timeout_seconds,
+        follow_redirects=True
+    )
+    supabase_client = PooledSupabaseClient(
+        settings.supabase_url,
+        settings.supabase_anon_key,
+        http_client
+    )
+    return supabase_client
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -108,9 +146,13 @@ async def init_db():
 
 async def close_db():
     """Close database connections"""
+    global supabase_client
     await async_engine.dispose()
+    if supabase_client is not None:
+        supabase_client.postgrest_http_client.close()
+        supabase_client = None
 
 
 def get_supabase_client() -> Client:
-    """Get Supabase client"""
-    return supabase_client
\ No newline at end of file
+    """Get Supabase client, creating it if the lifespan has not run (scripts, tests)"""
+    return supabase_client or open_supabase()
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Application logging configuration
+"""
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+from app.core.config import get_settings
+
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging() -> None:
+    """Route log records through a queue so request handlers never block on output"""
+    global _queue_handler, _listener
+    
+    if _listener is not None:
+        return
+    
+    settings = get_settings()
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(settings.log_level.upper())
+    root_logger.addHandler(_queue_handler)
+    
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued log records and detach the queue handler"""
+    global _queue_handler, _listener
+    
+    if _listener is None:
+        return
+    
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    _queue_handler = None
+    _listener = None
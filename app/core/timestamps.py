@@ -0,0 +1,24 @@
+"""
+Helpers for timestamps returned by Supabase
+"""
+from datetime import datetime
+from typing import Optional
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp returned by Supabase, or None if missing or malformed"""
+    if not value:
+        return None
+    # fromisoformat only understands a trailing Z from Python 3.11 on
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_epoch(value: Optional[str]) -> Optional[float]:
+    """Parse an ISO timestamp returned by Supabase into epoch seconds"""
+    parsed = parse_timestamp(value)
+    return parsed.timestamp() if parsed else None
@@ -2,13 +2,15 @@
 Main FastAPI application entry point
 """
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import get_settings
-from app.core.database import init_db, close_db
+from app.core.database import init_db, close_db, open_supabase
+from app.core.logging_config import setup_logging, shutdown_logging
 from app.auth.router import router as auth_router
 from app.api.routes.users import router as users_router
 from app.api.routes.decks import router as decks_router
@@ -24,10 +26,13 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
+    setup_logging()
     await init_db()
+    open_supabase()
     yield
     # Shutdown
     await close_db()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -35,7 +40,9 @@ app = FastAPI(
     title="Chinese-English Flashcards",
     description="A web application for learning Chinese through flashcards",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Serialize API responses with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
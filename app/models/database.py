@@ -7,8 +7,8 @@ from datetime import datetime, timezone
 from typing import Optional, List
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Integer, 
-    String, Text, UUID, Float, func
+    Boolean, Column, DateTime, ForeignKey, Index, Integer, 
+    SmallInteger, String, Text, UUID, Float, desc, func, text
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -103,6 +103,10 @@ class Deck(Base):
     study_sessions: Mapped[List["StudySession"]] = relationship(
         "StudySession", back_populates="deck"
     )
+    
+    __table_args__ = (
+        Index("decks_user", "user_id"),
+    )
 
 
 class Card(Base):
@@ -134,6 +138,10 @@ class Card(Base):
     card_interactions: Mapped[List["CardInteraction"]] = relationship(
         "CardInteraction", back_populates="card"
     )
+    
+    __table_args__ = (
+        Index("cards_deck", "deck_id", postgresql_include=["id"]),
+    )
 
 
 class UserCardProgress(Base):
@@ -190,8 +198,31 @@ class UserCardProgress(Base):
     user: Mapped["User"] = relationship("User", back_populates="card_progress")
     card: Mapped["Card"] = relationship("Card", back_populates="user_progress")
     
-    # Unique constraint
-    __table_args__ = ({"schema": None},)
+    # Unique constraint, covering the learning metrics read by the scheduler
+    __table_args__ = (
+        Index(
+            "ucp_user_card",
+            "user_id",
+            "card_id",
+            unique=True,
+            postgresql_include=[
+                "mastery_level",
+                "difficulty_score",
+                "quiz_attempts",
+                "quiz_correct",
+                "next_review_at",
+            ],
+        ),
+        # Mastery buckets and the difficult-cards ranking
+        Index("ucp_user_mastery", "user_id", "mastery_level"),
+        Index(
+            "ucp_user_quizzed",
+            "user_id",
+            "quiz_attempts",
+            postgresql_where=text("quiz_attempts >= 2"),
+        ),
+        {"schema": None},
+    )
 
 
 class StudySession(Base):
@@ -220,7 +251,8 @@ class StudySession(Base):
     session_duration: Mapped[int] = mapped_column(Integer, default=0)  # minutes
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
-        default=utc_now
+        nullable=False,
+        server_default=func.now()
     )
     
     # Relationships
@@ -229,6 +261,11 @@ class StudySession(Base):
     card_interactions: Mapped[List["CardInteraction"]] = relationship(
         "CardInteraction", back_populates="session"
     )
+    
+    # Recent sessions, daily progress and streak lookups
+    __table_args__ = (
+        Index("study_sessions_user_created", "user_id", desc("created_at")),
+    )
 
 
 class CardInteraction(Base):
@@ -252,15 +289,16 @@ class CardInteraction(Base):
         UUID(as_uuid=True), 
         ForeignKey("cards.id", ondelete="CASCADE")
     )
-    interaction_type: Mapped[str] = mapped_column(
-        String(20), 
+    interaction_type: Mapped[int] = mapped_column(
+        SmallInteger, 
         nullable=False
-    )  # 'flip', 'quiz_correct', 'quiz_incorrect'
+    )  # InteractionType: 0=flip, 1=quiz_correct, 2=quiz_incorrect
     direction: Mapped[Optional[str]] = mapped_column(String(20))  # for quiz interactions
     response_time: Mapped[Optional[int]] = mapped_column(Integer)  # milliseconds
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
-        default=utc_now
+        nullable=False,
+        server_default=func.now()
     )
     
     # Relationships
@@ -3,6 +3,7 @@ Pydantic schemas for API request/response validation
 """
 import uuid
 from datetime import datetime
+from enum import IntEnum
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field, validator
 
@@ -147,7 +148,7 @@ class CardWithProgress(CardResponse):
 
 class StudySessionCreate(BaseModel):
     deck_id: uuid.UUID
-    direction: str = Field(..., regex="^(chinese_to_english|english_to_chinese)$")
+    direction: str = Field(..., pattern="^(chinese_to_english|english_to_chinese)$")
 
 
 class StudySessionUpdate(BaseModel):
@@ -176,16 +177,32 @@ class StudySessionResponse(BaseModel):
         from_attributes = True
 
 
+class InteractionType(IntEnum):
+    """Card interaction kinds, stored as a smallint in card_interactions"""
+    FLIP = 0
+    QUIZ_CORRECT = 1
+    QUIZ_INCORRECT = 2
+    
+    @property
+    def label(self) -> str:
+        """Name used by the API, e.g. 'quiz_correct'"""
+        return self.name.lower()
+    
+    @classmethod
+    def from_label(cls, label: str) -> "InteractionType":
+        return cls[label.upper()]
+
+
 class CardInteractionCreate(BaseModel):
     session_id: uuid.UUID
     card_id: uuid.UUID
     interaction_type: str = Field(
         ..., 
-        regex="^(flip|quiz_correct|quiz_incorrect)$"
+        pattern="^(flip|quiz_correct|quiz_incorrect)$"
     )
     direction: Optional[str] = Field(
         None, 
-        regex="^(chinese_to_english|english_to_chinese)$"
+        pattern="^(chinese_to_english|english_to_chinese)$"
     )
     response_time: Optional[int] = None  # milliseconds
 
@@ -199,6 +216,12 @@ class CardInteractionResponse(BaseModel):
     response_time: Optional[int]
     created_at: datetime
     
+    @validator("interaction_type", pre=True)
+    def interaction_type_label(cls, v):
+        if isinstance(v, int):
+            return InteractionType(v).label
+        return v
+    
     class Config:
         from_attributes = True
 
@@ -254,7 +277,7 @@ class SearchParams(BaseModel):
     """Common search parameters"""
     query: Optional[str] = None
     sort_by: Optional[str] = None
-    sort_order: str = Field("asc", regex="^(asc|desc)$")
+    sort_order: str = Field("asc", pattern="^(asc|desc)$")
 
 
 class PaginatedResponse(BaseModel):
@@ -2,10 +2,13 @@
 Card service for CRUD operations and card management
 """
 from typing import List, Optional
+import logging
 import uuid
 from datetime import datetime
 from supabase import Client
 
+from app.core.cache import deck_card_ids_cache, deck_cards_cache
+from app.core.concurrency import gather_queries
 from app.schemas.schemas import (
     CardCreate, 
     CardUpdate, 
@@ -17,11 +20,19 @@ from app.schemas.schemas import (
     PaginatedResponse
 )
 
+logger = logging.getLogger(__name__)
+
 
 class CardService:
     def __init__(self, supabase_client: Client):
         self.supabase = supabase_client
     
+    @staticmethod
+    def _invalidate_deck_caches(deck_id) -> None:
+        """Drop cached lookups for a deck whose cards changed"""
+        deck_card_ids_cache.pop(str(deck_id))
+        deck_cards_cache.pop(str(deck_id))
+    
     async def create_card(self, deck_id: uuid.UUID, card_create: CardCreate) -> Optional[CardResponse]:
         """Create a new card in a deck"""
         try:
@@ -36,11 +47,12 @@ class CardService:
             response = self.supabase.table("cards").insert(card_data).execute()
             
             if response.data:
+                self._invalidate_deck_caches(deck_id)
                 return CardResponse(**response.data[0])
             
             return None
-        except Exception as e:
-            print(f"Error creating card: {e}")
+        except Exception:
+            logger.exception("Error creating card")
             return None
     
     async def get_deck_cards(
@@ -77,8 +89,8 @@ class CardService:
             response = query.execute()
             
             return [CardResponse(**card) for card in response.data]
-        except Exception as e:
-            print(f"Error getting deck cards: {e}")
+        except Exception:
+            logger.exception("Error getting deck cards")
             return []
     
     async def get_card_by_id(self, card_id: uuid.UUID) -> Optional[CardResponse]:
@@ -90,8 +102,8 @@ class CardService:
                 return CardResponse(**response.data[0])
             
             return None
-        except Exception as e:
-            print(f"Error getting card by ID: {e}")
+        except Exception:
+            logger.exception("Error getting card by ID")
             return None
     
     async def get_card_with_progress(self, card_id: uuid.UUID, user_id: uuid.UUID) -> Optional[CardWithProgress]:
@@ -111,10 +123,39 @@ class CardService:
             
             return CardWithProgress(**card.dict(), user_progress=progress)
             
-        except Exception as e:
-            print(f"Error getting card with progress: {e}")
+        except Exception:
+            logger.exception("Error getting card with progress")
             return None
     
+    async def get_cards_with_progress(self, card_ids: List[uuid.UUID], user_id: uuid.UUID) -> List[CardWithProgress]:
+        """Get several cards with user progress in two queries, in the order given"""
+        try:
+            if not card_ids:
+                return []
+            
+            ids = [str(card_id) for card_id in card_ids]
+            
+            cards_response, progress_response = await gather_queries([
+                self.supabase.table("cards").select("*").in_("id", ids),
+                self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).in_("card_id", ids)
+            ])
+            
+            cards_by_id = {card["id"]: card for card in cards_response.data}
+            progress_by_card = {
+                progress["card_id"]: UserCardProgressResponse(**progress)
+                for progress in progress_response.data
+            }
+            
+            return [
+                CardWithProgress(**cards_by_id[card_id], user_progress=progress_by_card.get(card_id))
+                for card_id in ids
+                if card_id in cards_by_id
+            ]
+            
+        except Exception:
+            logger.exception("Error getting cards with progress")
+            return []
+    
     async def update_card(self, card_id: uuid.UUID, card_update: CardUpdate) -> Optional[CardResponse]:
         """Update a card"""
         try:
@@ -124,11 +165,12 @@ class CardService:
                 response = self.supabase.table("cards").update(update_data).eq("id", str(card_id)).execute()
                 
                 if response.data:
+                    self._invalidate_deck_caches(response.data[0]["deck_id"])
                     return CardResponse(**response.data[0])
             
             return await self.get_card_by_id(card_id)
-        except Exception as e:
-            print(f"Error updating card: {e}")
+        except Exception:
+            logger.exception("Error updating card")
             return None
     
     async def delete_card(self, card_id: uuid.UUID) -> bool:
@@ -136,9 +178,12 @@ class CardService:
         try:
             response = self.supabase.table("cards").delete().eq("id", str(card_id)).execute()
             
+            for card_data in response.data:
+                self._invalidate_deck_caches(card_data["deck_id"])
+            
             return len(response.data) > 0
-        except Exception as e:
-            print(f"Error deleting card: {e}")
+        except Exception:
+            logger.exception("Error deleting card")
             return False
     
     async def delete_cards_bulk(self, card_ids: List[uuid.UUID]) -> int:
@@ -150,8 +195,8 @@ class CardService:
                     deleted_count += 1
             
             return deleted_count
-        except Exception as e:
-            print(f"Error bulk deleting cards: {e}")
+        except Exception:
+            logger.exception("Error bulk deleting cards")
             return 0
     
     async def get_cards_count(self, deck_id: uuid.UUID, search: Optional[SearchParams] = None) -> int:
@@ -169,8 +214,8 @@ class CardService:
             
             response = query.execute()
             return response.count or 0
-        except Exception as e:
-            print(f"Error getting cards count: {e}")
+        except Exception:
+            logger.exception("Error getting cards count")
             return 0
     
     async def get_paginated_cards(
@@ -194,8 +239,8 @@ class CardService:
                 size=pagination.size,
                 pages=(total + pagination.size - 1) // pagination.size if total > 0 else 0
             )
-        except Exception as e:
-            print(f"Error getting paginated cards: {e}")
+        except Exception:
+            logger.exception("Error getting paginated cards")
             return PaginatedResponse(
                 items=[],
                 total=0,
@@ -219,8 +264,8 @@ class CardService:
             deck_response = self.supabase.table("decks").select("id").eq("id", deck_id).eq("user_id", str(user_id)).execute()
             
             return len(deck_response.data) > 0
-        except Exception as e:
-            print(f"Error verifying card ownership: {e}")
+        except Exception:
+            logger.exception("Error verifying card ownership")
             return False
     
     async def get_random_cards_for_study(
@@ -234,17 +279,13 @@ class CardService:
             # Get all cards in the deck
             cards = await self.get_deck_cards(deck_id)
             
-            # For each card, get user progress
-            cards_with_progress = []
-            for card in cards:
-                card_with_progress = await self.get_card_with_progress(card.id, user_id)
-                if card_with_progress:
-                    cards_with_progress.append(card_with_progress)
+            # Get user progress for the cards that will be returned, all at once
+            cards_with_progress = await self.get_cards_with_progress([card.id for card in cards[:limit]], user_id)
             
             # For now, return first N cards (in a real implementation, 
             # this would use the adaptive learning algorithm)
             return cards_with_progress[:limit]
             
-        except Exception as e:
-            print(f"Error getting random cards for study: {e}")
+        except Exception:
+            logger.exception("Error getting random cards for study")
             return []
\ No newline at end of file
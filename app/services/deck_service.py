@@ -2,10 +2,13 @@
 Deck service for CRUD operations and deck management
 """
 from typing import List, Optional
+import logging
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from supabase import Client
 
+from app.core.cache import deck_card_ids_cache, deck_cards_cache
+from app.core.concurrency import gather_queries
 from app.schemas.schemas import (
     DeckCreate, 
     DeckUpdate, 
@@ -14,6 +17,8 @@ from app.schemas.schemas import (
     DeckWithProgress
 )
 
+logger = logging.getLogger(__name__)
+
 
 class DeckService:
     def __init__(self, supabase_client: Client):
@@ -26,7 +31,7 @@ class DeckService:
                 "user_id": str(user_id),
                 "name": deck_create.name,
                 "description": deck_create.description,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
                 "total_study_time": 0
             }
             
@@ -38,8 +43,8 @@ class DeckService:
                 return DeckResponse(**deck_data)
             
             return None
-        except Exception as e:
-            print(f"Error creating deck: {e}")
+        except Exception:
+            logger.exception("Error creating deck")
             return None
     
     async def get_user_decks(self, user_id: uuid.UUID) -> List[DeckResponse]:
@@ -47,17 +52,21 @@ class DeckService:
         try:
             response = self.supabase.table("decks").select("*").eq("user_id", str(user_id)).execute()
             
+            # Get card count for each deck concurrently
+            count_responses = await gather_queries(
+                self.supabase.table("cards").select("id", count="exact").eq("deck_id", deck_data["id"])
+                for deck_data in response.data
+            )
+            
             decks = []
-            for deck_data in response.data:
-                # Get card count for each deck
-                cards_response = self.supabase.table("cards").select("id", count="exact").eq("deck_id", deck_data["id"]).execute()
+            for deck_data, cards_response in zip(response.data, count_responses):
                 deck_data["card_count"] = cards_response.count or 0
                 
                 decks.append(DeckResponse(**deck_data))
             
             return decks
-        except Exception as e:
-            print(f"Error getting user decks: {e}")
+        except Exception:
+            logger.exception("Error getting user decks")
             return []
     
     async def get_deck_by_id(self, deck_id: uuid.UUID, user_id: Optional[uuid.UUID] = None) -> Optional[DeckResponse]:
@@ -79,8 +88,8 @@ class DeckService:
                 return DeckResponse(**deck_data)
             
             return None
-        except Exception as e:
-            print(f"Error getting deck by ID: {e}")
+        except Exception:
+            logger.exception("Error getting deck by ID")
             return None
     
     async def update_deck(self, deck_id: uuid.UUID, user_id: uuid.UUID, deck_update: DeckUpdate) -> Optional[DeckResponse]:
@@ -88,15 +97,22 @@ class DeckService:
         try:
             update_data = deck_update.dict(exclude_unset=True)
             
-            if update_data:
-                response = self.supabase.table("decks").update(update_data).eq("id", str(deck_id)).eq("user_id", str(user_id)).execute()
-                
-                if response.data:
-                    return await self.get_deck_by_id(deck_id, user_id)
+            if not update_data:
+                return await self.get_deck_by_id(deck_id, user_id)
+            
+            response = self.supabase.table("decks").update(update_data).eq("id", str(deck_id)).eq("user_id", str(user_id)).execute()
+            
+            if not response.data:
+                return None
+            
+            # The update already returns the fresh row; only the card count needs a lookup
+            deck_data = response.data[0]
+            cards_response = self.supabase.table("cards").select("id", count="exact").eq("deck_id", str(deck_id)).execute()
+            deck_data["card_count"] = cards_response.count or 0
             
-            return await self.get_deck_by_id(deck_id, user_id)
-        except Exception as e:
-            print(f"Error updating deck: {e}")
+            return DeckResponse(**deck_data)
+        except Exception:
+            logger.exception("Error updating deck")
             return None
     
     async def delete_deck(self, deck_id: uuid.UUID, user_id: uuid.UUID) -> bool:
@@ -104,9 +120,13 @@ class DeckService:
         try:
             response = self.supabase.table("decks").delete().eq("id", str(deck_id)).eq("user_id", str(user_id)).execute()
             
+            if response.data:
+                deck_card_ids_cache.pop(str(deck_id))
+                deck_cards_cache.pop(str(deck_id))
+            
             return len(response.data) > 0
-        except Exception as e:
-            print(f"Error deleting deck: {e}")
+        except Exception:
+            logger.exception("Error deleting deck")
             return False
     
     async def get_deck_with_progress(self, deck_id: uuid.UUID, user_id: uuid.UUID) -> Optional[DeckWithProgress]:
@@ -143,9 +163,12 @@ class DeckService:
             total_accuracy = 0.0
             cards_with_attempts = 0
             
-            for card_id in card_ids:
-                progress_response = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).eq("card_id", card_id).execute()
-                
+            progress_responses = await gather_queries(
+                self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).eq("card_id", card_id)
+                for card_id in card_ids
+            )
+            
+            for progress_response in progress_responses:
                 if progress_response.data:
                     progress_data = progress_response.data[0]
                     mastery_level = progress_data.get("mastery_level", 0)
@@ -180,8 +203,8 @@ class DeckService:
             
             return DeckWithProgress(**deck.dict(), user_progress=progress)
             
-        except Exception as e:
-            print(f"Error getting deck with progress: {e}")
+        except Exception:
+            logger.exception("Error getting deck with progress")
             return None
     
     async def update_deck_study_time(self, deck_id: uuid.UUID, additional_seconds: int) -> bool:
@@ -196,10 +219,10 @@ class DeckService:
             
             response = self.supabase.table("decks").update({
                 "total_study_time": new_total,
-                "last_studied_at": datetime.utcnow().isoformat()
+                "last_studied_at": datetime.now(timezone.utc).isoformat()
             }).eq("id", str(deck_id)).execute()
             
             return len(response.data) > 0
-        except Exception as e:
-            print(f"Error updating deck study time: {e}")
+        except Exception:
+            logger.exception("Error updating deck study time")
             return False
\ No newline at end of file
@@ -1,15 +1,51 @@
 """
 Adaptive learning algorithm service for flashcard scheduling and difficulty management
 """
+import logging
 import uuid
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
+import numpy as np
 from supabase import Client
 
+from app.core.cache import deck_card_ids_cache
+from app.core.timestamps import parse_epoch
 from app.schemas.schemas import CardWithProgress, UserCardProgressResponse
 
+logger = logging.getLogger(__name__)
+
+
+# user_card_progress columns read into ProgressRow
+PROGRESS_ROW_COLUMNS = "card_id, mastery_level, difficulty_score, quiz_attempts, quiz_correct, next_review_at, consecutive_correct"
+
+
+@dataclass(slots=True)
+class ProgressRow:
+    """Typed view of a user_card_progress row used by the scheduler"""
+    card_id: str
+    mastery_level: int
+    difficulty_score: float
+    quiz_attempts: int
+    quiz_correct: int
+    next_review_at: Optional[float]  # epoch seconds
+    consecutive_correct: int
+    
+    @classmethod
+    def from_record(cls, record: Dict) -> "ProgressRow":
+        """Build a row from a Supabase record, applying column defaults once"""
+        return cls(
+            card_id=record["card_id"],
+            mastery_level=record.get("mastery_level", 0),
+            difficulty_score=record.get("difficulty_score", 1.0),
+            quiz_attempts=record.get("quiz_attempts", 0),
+            quiz_correct=record.get("quiz_correct", 0),
+            next_review_at=parse_epoch(record.get("next_review_at")),
+            consecutive_correct=record.get("consecutive_correct", 0)
+        )
+
 
 @dataclass
 class LearningConfig:
@@ -38,6 +74,24 @@ class LearningConfig:
     learning_weight: float = 1.2
     review_weight: float = 1.0
     mastered_weight: float = 0.3
+    
+    # Lookup tables indexed by mastery level (0=new, 1=learning, 2=review, 3=mastered)
+    base_intervals: Tuple[int, int, int, int] = field(init=False, repr=False)
+    priority_weights: Tuple[float, float, float, float] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.base_intervals = (
+            self.new_card_interval,
+            self.learning_base_interval,
+            self.review_base_interval,
+            self.mastered_base_interval
+        )
+        self.priority_weights = (
+            self.new_card_weight,
+            self.learning_weight,
+            self.review_weight,
+            self.mastered_weight
+        )
 
 
 class LearningAlgorithm:
@@ -46,6 +100,15 @@ class LearningAlgorithm:
     def __init__(self, supabase_client: Client, config: Optional[LearningConfig] = None):
         self.supabase = supabase_client
         self.config = config or LearningConfig()
+        # Private generator for card selection, seeded from os.urandom
+        self._rng = random.Random()
+        
+        # Progress row builders by interaction type
+        self._builders = {
+            "flip": self._build_flip_update,
+            "quiz_correct": partial(self._build_quiz_update, is_correct=True),
+            "quiz_incorrect": partial(self._build_quiz_update, is_correct=False)
+        }
     
     async def update_card_progress(
         self, 
@@ -57,127 +120,148 @@ class LearningAlgorithm:
     ) -> Optional[UserCardProgressResponse]:
         """Update user progress for a card based on interaction"""
         
+        builder = self._builders.get(interaction_type)
+        if builder is None:
+            return None
+        
         try:
-            # Get existing progress or create new
+            # Get existing progress or start from a fresh record
             progress_response = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).eq("card_id", str(card_id)).execute()
             
-            now = datetime.utcnow()
+            now_iso = datetime.now(timezone.utc).isoformat()
             
             if progress_response.data:
-                # Update existing progress
                 progress_data = progress_response.data[0]
-                progress_id = progress_data["id"]
-                
-                # Update based on interaction type
-                if interaction_type == "flip":
-                    update_data = {
-                        "flip_count": progress_data["flip_count"] + 1,
-                        "last_flipped_at": now.isoformat(),
-                        "updated_at": now.isoformat()
-                    }
-                    
-                    if not progress_data["first_flipped_at"]:
-                        update_data["first_flipped_at"] = now.isoformat()
-                
-                elif interaction_type in ["quiz_correct", "quiz_incorrect"]:
-                    is_correct = interaction_type == "quiz_correct"
-                    
-                    new_attempts = progress_data["quiz_attempts"] + 1
-                    new_correct = progress_data["quiz_correct"] + (1 if is_correct else 0)
-                    
-                    # Calculate new difficulty score
-                    new_difficulty = self._calculate_difficulty_score(
-                        current_score=progress_data["difficulty_score"],
-                        is_correct=is_correct,
-                        consecutive_correct=progress_data["consecutive_correct"]
-                    )
-                    
-                    # Calculate new mastery level
-                    new_mastery_level = self._calculate_mastery_level(
-                        quiz_attempts=new_attempts,
-                        quiz_correct=new_correct,
-                        current_level=progress_data["mastery_level"]
-                    )
-                    
-                    # Calculate next review time
-                    next_review = self._calculate_next_review_time(
-                        mastery_level=new_mastery_level,
-                        difficulty_score=new_difficulty,
-                        is_correct=is_correct
-                    )
-                    
-                    update_data = {
-                        "quiz_attempts": new_attempts,
-                        "quiz_correct": new_correct,
-                        "last_quiz_attempt_at": now.isoformat(),
-                        "difficulty_score": new_difficulty,
-                        "mastery_level": new_mastery_level,
-                        "next_review_at": next_review.isoformat(),
-                        "consecutive_correct": progress_data["consecutive_correct"] + 1 if is_correct else 0,
-                        "updated_at": now.isoformat()
-                    }
-                
-                # Update the record
-                update_response = self.supabase.table("user_card_progress").update(update_data).eq("id", progress_id).execute()
-                
-                if update_response.data:
-                    return UserCardProgressResponse(**update_response.data[0])
-            
             else:
-                # Create new progress record
-                if interaction_type == "flip":
-                    progress_data = {
-                        "user_id": str(user_id),
-                        "card_id": str(card_id),
-                        "flip_count": 1,
-                        "first_flipped_at": now.isoformat(),
-                        "last_flipped_at": now.isoformat(),
-                        "quiz_attempts": 0,
-                        "quiz_correct": 0,
-                        "difficulty_score": 1.0,
-                        "mastery_level": 0,
-                        "next_review_at": now.isoformat(),
-                        "consecutive_correct": 0,
-                        "total_study_time": 0,
-                        "created_at": now.isoformat(),
-                        "updated_at": now.isoformat()
-                    }
-                
-                elif interaction_type in ["quiz_correct", "quiz_incorrect"]:
-                    is_correct = interaction_type == "quiz_correct"
-                    
-                    difficulty_score = self._calculate_difficulty_score(1.0, is_correct, 0)
-                    mastery_level = self._calculate_mastery_level(1, 1 if is_correct else 0, 0)
-                    next_review = self._calculate_next_review_time(mastery_level, difficulty_score, is_correct)
-                    
-                    progress_data = {
-                        "user_id": str(user_id),
-                        "card_id": str(card_id),
-                        "flip_count": 0,
-                        "quiz_attempts": 1,
-                        "quiz_correct": 1 if is_correct else 0,
-                        "last_quiz_attempt_at": now.isoformat(),
-                        "difficulty_score": difficulty_score,
-                        "mastery_level": mastery_level,
-                        "next_review_at": next_review.isoformat(),
-                        "consecutive_correct": 1 if is_correct else 0,
-                        "total_study_time": 0,
-                        "created_at": now.isoformat(),
-                        "updated_at": now.isoformat()
-                    }
-                
-                # Insert new record
-                insert_response = self.supabase.table("user_card_progress").insert(progress_data).execute()
-                
-                if insert_response.data:
-                    return UserCardProgressResponse(**insert_response.data[0])
+                progress_data = self._new_progress_row(user_id, card_id, now_iso)
+            
+            # Write the updated record in one call, keyed by the unique (user_id, card_id) index
+            upsert_response = self.supabase.table("user_card_progress").upsert(
+                builder(progress_data, now_iso),
+                on_conflict="user_id,card_id"
+            ).execute()
+            
+            if upsert_response.data:
+                return UserCardProgressResponse(**upsert_response.data[0])
             
             return None
             
-        except Exception as e:
-            print(f"Error updating card progress: {e}")
+        except Exception:
+            logger.exception("Error updating card progress")
             return None
     
+    async def update_card_progresses(
+        self,
+        user_id: uuid.UUID,
+        interactions: List[Tuple[uuid.UUID, str]]
+    ) -> bool:
+        """Apply a batch of (card_id, interaction_type) pairs in order with one read and one write"""
+        
+        interactions = [
+            (str(card_id), self._builders[interaction_type])
+            for card_id, interaction_type in interactions
+            if interaction_type in self._builders
+        ]
+        if not interactions:
+            return True
+        
+        try:
+            card_ids = list(dict.fromkeys(card_id for card_id, _ in interactions))
+            progress_response = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).in_("card_id", card_ids).execute()
+            
+            now_iso = datetime.now(timezone.utc).isoformat()
+            progress_by_card = {progress["card_id"]: progress for progress in progress_response.data}
+            
+            # Fold repeated interactions with the same card into a single row
+            for card_id, builder in interactions:
+                progress_data = progress_by_card.get(card_id) or self._new_progress_row(user_id, card_id, now_iso)
+                progress_by_card[card_id] = builder(progress_data, now_iso)
+            
+            # New rows carry no id, so let missing columns take their defaults rather than null.
+            # Callers don't need the written rows back, so skip returning them.
+            self.supabase.table("user_card_progress").upsert(
+                [progress_by_card[card_id] for card_id in card_ids],
+                on_conflict="user_id,card_id",
+                default_to_null=False,
+                returning="minimal"
+            ).execute()
+            
+            return True
+            
+        except Exception:
+            logger.exception("Error updating card progress batch")
+            return False
+    
+    def _new_progress_row(self, user_id: uuid.UUID, card_id: uuid.UUID, now_iso: str) -> Dict:
+        """Initial progress record for a card the user has not interacted with yet"""
+        return {
+            "user_id": str(user_id),
+            "card_id": str(card_id),
+            "flip_count": 0,
+            "first_flipped_at": None,
+            "last_flipped_at": None,
+            "quiz_attempts": 0,
+            "quiz_correct": 0,
+            "last_quiz_attempt_at": None,
+            "difficulty_score": 1.0,
+            "mastery_level": 0,
+            "next_review_at": now_iso,
+            "consecutive_correct": 0,
+            "total_study_time": 0,
+            "created_at": now_iso,
+            "updated_at": now_iso
+        }
+    
+    def _build_flip_update(self, progress_data: Dict, now_iso: str) -> Dict:
+        """Progress record after the card was flipped"""
+        return {
+            **progress_data,
+            "flip_count": progress_data["flip_count"] + 1,
+            "first_flipped_at": progress_data["first_flipped_at"] or now_iso,
+            "last_flipped_at": now_iso,
+            "updated_at": now_iso
+        }
+    
+    def _build_quiz_update(self, progress_data: Dict, now_iso: str, is_correct: bool) -> Dict:
+        """Progress record after a quiz answer"""
+        progress = ProgressRow.from_record(progress_data)
+        
+        new_attempts = progress.quiz_attempts + 1
+        new_correct = progress.quiz_correct + (1 if is_correct else 0)
+        
+        # Calculate new difficulty score
+        new_difficulty = self._calculate_difficulty_score(
+            current_score=progress.difficulty_score,
+            is_correct=is_correct,
+            consecutive_correct=progress.consecutive_correct
+        )
+        
+        # Calculate new mastery level
+        new_mastery_level = self._calculate_mastery_level(
+            quiz_attempts=new_attempts,
+            quiz_correct=new_correct,
+            current_level=progress.mastery_level
+        )
+        
+        # Calculate next review time
+        next_review = self._calculate_next_review_time(
+            mastery_level=new_mastery_level,
+            difficulty_score=new_difficulty,
+            is_correct=is_correct
+        )
+        
+        return {
+            **progress_data,
+            "quiz_attempts": new_attempts,
+            "quiz_correct": new_correct,
+            "last_quiz_attempt_at": now_iso,
+            "difficulty_score": new_difficulty,
+            "mastery_level": new_mastery_level,
+            "next_review_at": next_review.isoformat(),
+            "consecutive_correct": progress.consecutive_correct + 1 if is_correct else 0,
+            "updated_at": now_iso
+        }
+    
     def _calculate_difficulty_score(
         self, 
         current_score: float, 
@@ -237,17 +321,10 @@ class LearningAlgorithm:
     ) -> datetime:
         """Calculate when the card should next be reviewed"""
         
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         
-        # Base intervals by mastery level
-        if mastery_level == 0:  # New
-            base_interval = self.config.new_card_interval
-        elif mastery_level == 1:  # Learning
-            base_interval = self.config.learning_base_interval
-        elif mastery_level == 2:  # Review
-            base_interval = self.config.review_base_interval
-        else:  # Mastered
-            base_interval = self.config.mastered_base_interval
+        # Base intervals by mastery level (anything above 3 counts as mastered)
+        base_interval = self.config.base_intervals[min(mastery_level, 3)]
         
         # Adjust interval based on difficulty and correctness
         if is_correct:
@@ -273,35 +350,42 @@ class LearningAlgorithm:
     ) -> List[uuid.UUID]:
         """Select cards for study session using adaptive algorithm"""
         
+        card_ids: List[str] = []
+        
         try:
-            # Get all cards in the deck
-            cards_response = self.supabase.table("cards").select("id").eq("deck_id", str(deck_id)).execute()
+            # Get all cards in the deck, reusing a recent lookup for the same deck.
+            # card_ids is only rebound once the ids are known, so the fallback below stays a list
+            cached_ids = deck_card_ids_cache.get(str(deck_id))
+            if cached_ids is None:
+                cards_response = self.supabase.table("cards").select("id").eq("deck_id", str(deck_id)).execute()
+                cached_ids = [card["id"] for card in cards_response.data]
+                deck_card_ids_cache.set(str(deck_id), cached_ids)
+            card_ids = cached_ids
             
-            if not cards_response.data:
+            if not card_ids:
                 return []
             
-            card_ids = [card["id"] for card in cards_response.data]
+            # Get user progress for the deck's cards, parsing review times once per row.
+            # Filtering through the cards join keeps the URL short however large the deck is
+            progress_response = self.supabase.table("user_card_progress").select(
+                f"{PROGRESS_ROW_COLUMNS}, cards!inner(deck_id)"
+            ).eq("user_id", str(user_id)).eq("cards.deck_id", str(deck_id)).execute()
             
-            # Get user progress for all cards
-            card_priorities = []
-            now = datetime.utcnow()
+            progress_rows = {}
+            for record in progress_response.data:
+                progress = ProgressRow.from_record(record)
+                progress_rows[progress.card_id] = progress
             
-            for card_id in card_ids:
-                progress_response = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).eq("card_id", card_id).execute()
-                
-                if progress_response.data:
-                    progress = progress_response.data[0]
-                    
-                    # Calculate priority score
-                    priority = self._calculate_card_priority(progress, now, include_overdue)
-                else:
-                    # New card - high priority
-                    priority = self.config.new_card_weight * 2.0
-                
-                card_priorities.append((card_id, priority))
+            # Score every card in one vectorized pass
+            priorities = self._calculate_card_priorities(
+                [progress_rows.get(card_id) for card_id in card_ids],
+                datetime.now(timezone.utc).timestamp(),
+                include_overdue
+            )
             
-            # Sort by priority (higher is better)
-            card_priorities.sort(key=lambda x: x[1], reverse=True)
+            # Sort by priority (higher is better), keeping deck order for ties
+            order = np.argsort(-priorities, kind="stable")
+            card_priorities = [(card_ids[i], float(priorities[i])) for i in order]
             
             # Select top cards, with some randomization to avoid predictability
             selected_count = min(target_count, len(card_priorities))
@@ -313,50 +397,51 @@ class LearningAlgorithm:
                 # Use weighted selection for variety
                 selected_cards = self._weighted_selection(card_priorities, selected_count)
             
-            return selected_cards
+            # Ids stay strings for the queries above; parse only the selected ones
+            return [uuid.UUID(card_id) for card_id in selected_cards]
             
-        except Exception as e:
-            print(f"Error selecting cards for study: {e}")
-            return card_ids[:target_count] if card_ids else []
+        except Exception:
+            logger.exception("Error selecting cards for study")
+            return [uuid.UUID(card_id) for card_id in card_ids[:target_count]]
     
-    def _calculate_card_priority(
+    def _calculate_card_priorities(
         self, 
-        progress: Dict, 
-        current_time: datetime, 
+        progress_rows: List[Optional[ProgressRow]], 
+        current_ts: float, 
         include_overdue: bool
-    ) -> float:
-        """Calculate priority score for a card"""
+    ) -> np.ndarray:
+        """Calculate priority scores for a batch of cards (None marks a card without progress)"""
         
-        mastery_level = progress.get("mastery_level", 0)
-        difficulty_score = progress.get("difficulty_score", 1.0)
-        next_review_str = progress.get("next_review_at")
+        count = len(progress_rows)
+        mastery_levels = np.zeros(count, dtype=np.intp)
+        difficulty_scores = np.ones(count)
+        next_reviews = np.full(count, np.nan)
+        has_progress = np.zeros(count, dtype=bool)
         
-        # Base priority by mastery level
-        if mastery_level == 0:  # New
-            base_priority = self.config.new_card_weight
-        elif mastery_level == 1:  # Learning
-            base_priority = self.config.learning_weight
-        elif mastery_level == 2:  # Review
-            base_priority = self.config.review_weight
-        else:  # Mastered
-            base_priority = self.config.mastered_weight
+        for i, progress in enumerate(progress_rows):
+            if progress is None:
+                continue
+            has_progress[i] = True
+            mastery_levels[i] = progress.mastery_level
+            difficulty_scores[i] = progress.difficulty_score
+            if progress.next_review_at is not None:
+                next_reviews[i] = progress.next_review_at
         
-        # Adjust by difficulty
-        priority = base_priority * difficulty_score
+        # Base priority by mastery level (anything above 3 counts as mastered), adjusted by difficulty
+        weights = np.asarray(self.config.priority_weights)
+        priorities = weights[np.minimum(mastery_levels, 3)] * difficulty_scores
         
         # Boost overdue cards
-        if include_overdue and next_review_str:
-            try:
-                next_review = datetime.fromisoformat(next_review_str.replace('Z', '+00:00'))
-                if next_review <= current_time:
-                    # Card is overdue
-                    overdue_hours = (current_time - next_review).total_seconds() / 3600
-                    overdue_multiplier = 1.0 + min(overdue_hours / 24, 2.0)  # Max 3x boost
-                    priority *= overdue_multiplier * self.config.overdue_weight
-            except Exception:
-                pass
-        
-        return priority
+        if include_overdue:
+            overdue = next_reviews <= current_ts  # NaN (no review time) compares False
+            overdue_hours = (current_ts - next_reviews[overdue]) / 3600
+            overdue_multiplier = 1.0 + np.minimum(overdue_hours / 24, 2.0)  # Max 3x boost
+            priorities[overdue] *= overdue_multiplier * self.config.overdue_weight
+        
+        # New card - high priority
+        priorities[~has_progress] = self.config.new_card_weight * 2.0
+        
+        return priorities
     
     def _weighted_selection(
         self, 
@@ -385,7 +470,7 @@ class LearningAlgorithm:
                 break
             
             # Select based on weights
-            selected_idx = random.choices(range(len(remaining_ids)), weights=remaining_weights)[0]
+            selected_idx = self._rng.choices(range(len(remaining_ids)), weights=remaining_weights)[0]
             selected.append(remaining_ids[selected_idx])
             
             # Remove selected card
@@ -398,73 +483,35 @@ class LearningAlgorithm:
         """Get study statistics for adaptive algorithm tuning"""
         
         try:
-            query = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id))
+            # Aggregated server-side into a single row
+            response = self.supabase.rpc(
+                "study_stats",
+                {"uid": str(user_id), "did": str(deck_id) if deck_id else None}
+            ).execute()
             
-            if deck_id:
-                # Filter by deck - need to join with cards table
-                cards_response = self.supabase.table("cards").select("id").eq("deck_id", str(deck_id)).execute()
-                
-                if cards_response.data:
-                    card_ids = [card["id"] for card in cards_response.data]
-                    query = query.in_("card_id", card_ids)
-                else:
-                    return {}
-            
-            progress_response = query.execute()
-            
-            if not progress_response.data:
+            if not response.data or not response.data[0]["total_cards"]:
                 return {}
             
-            # Calculate statistics
-            total_cards = len(progress_response.data)
-            mastery_counts = {0: 0, 1: 0, 2: 0, 3: 0}
-            total_attempts = 0
-            total_correct = 0
-            avg_difficulty = 0.0
-            overdue_count = 0
-            
-            now = datetime.utcnow()
-            
-            for progress in progress_response.data:
-                mastery_level = progress.get("mastery_level", 0)
-                mastery_counts[mastery_level] += 1
-                
-                attempts = progress.get("quiz_attempts", 0)
-                correct = progress.get("quiz_correct", 0)
-                total_attempts += attempts
-                total_correct += correct
-                
-                difficulty = progress.get("difficulty_score", 1.0)
-                avg_difficulty += difficulty
-                
-                # Check if overdue
-                next_review_str = progress.get("next_review_at")
-                if next_review_str:
-                    try:
-                        next_review = datetime.fromisoformat(next_review_str.replace('Z', '+00:00'))
-                        if next_review <= now:
-                            overdue_count += 1
-                    except Exception:
-                        pass
-            
-            avg_difficulty = avg_difficulty / total_cards if total_cards > 0 else 0.0
+            stats = response.data[0]
+            total_attempts = stats["total_attempts"]
+            total_correct = stats["total_correct"]
             overall_accuracy = total_correct / total_attempts if total_attempts > 0 else 0.0
             
             return {
-                "total_cards": total_cards,
+                "total_cards": stats["total_cards"],
                 "mastery_distribution": {
-                    "new": mastery_counts[0],
-                    "learning": mastery_counts[1],
-                    "review": mastery_counts[2],
-                    "mastered": mastery_counts[3]
+                    "new": stats["mastery_0"],
+                    "learning": stats["mastery_1"],
+                    "review": stats["mastery_2"],
+                    "mastered": stats["mastery_3"]
                 },
                 "overall_accuracy": overall_accuracy,
-                "average_difficulty": avg_difficulty,
-                "overdue_cards": overdue_count,
+                "average_difficulty": stats["avg_difficulty"],
+                "overdue_cards": stats["overdue_count"],
                 "total_attempts": total_attempts,
                 "total_correct": total_correct
             }
             
-        except Exception as e:
-            print(f"Error getting study statistics: {e}")
+        except Exception:
+            logger.exception("Error getting study statistics")
             return {}
\ No newline at end of file
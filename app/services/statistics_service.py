@@ -1,14 +1,29 @@
 """
 Statistics service for tracking and analyzing user learning progress
 """
+import asyncio
+import logging
 import uuid
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+import pandas as pd
 from supabase import Client
 
+from app.core.cache import statistics_cache
+from app.core.concurrency import gather_queries, run_query
+from app.core.timestamps import parse_timestamp
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Deck columns read by _build_deck_stats
+DECK_STATS_COLUMNS = "id, name, total_study_time, last_studied_at"
+
+# Per-day totals returned by daily_learning_progress
+DAILY_PROGRESS_COLUMNS = ["sessions", "cards_studied", "correct", "attempts", "study_time"]
+
+
+@dataclass(slots=True, frozen=True)
 class LearningStats:
     """Container for learning statistics"""
     total_study_time_minutes: int
@@ -22,7 +37,7 @@ class LearningStats:
     average_session_duration: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DeckStats:
     """Container for deck-specific statistics"""
     deck_id: str
@@ -36,7 +51,7 @@ class DeckStats:
     last_studied_at: Optional[datetime]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CardStats:
     """Container for card-specific statistics"""
     card_id: str
@@ -62,70 +77,39 @@ class StatisticsService:
     async def get_user_overview_stats(self, user_id: uuid.UUID) -> LearningStats:
         """Get overall learning statistics for a user"""
         
+        cache_key = (str(user_id), "overview")
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Get user statistics record
-            user_stats_response = self.supabase.table("user_statistics").select("*").eq("user_id", str(user_id)).execute()
-            
-            # Get user card progress
-            progress_response = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).execute()
-            
-            # Get recent study sessions (last 30 days)
             thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            sessions_response = self.supabase.table("study_sessions").select("*").eq("user_id", str(user_id)).gte("created_at", thirty_days_ago.isoformat()).execute()
-            
-            # Calculate statistics
-            if user_stats_response.data:
-                user_stats = user_stats_response.data[0]
-                total_study_time = user_stats.get("study_time_minutes", 0)
-                total_quiz_attempts = user_stats.get("total_quiz_attempts", 0)
-                total_correct = user_stats.get("total_correct_answers", 0)
-            else:
-                total_study_time = 0
-                total_quiz_attempts = 0
-                total_correct = 0
-            
-            # Calculate mastery distribution
-            mastery_counts = {"new": 0, "learning": 0, "review": 0, "mastered": 0}
-            total_cards_studied = len(progress_response.data)
-            
-            for progress in progress_response.data:
-                mastery_level = progress.get("mastery_level", 0)
-                if mastery_level == 0:
-                    mastery_counts["new"] += 1
-                elif mastery_level == 1:
-                    mastery_counts["learning"] += 1
-                elif mastery_level == 2:
-                    mastery_counts["review"] += 1
-                else:
-                    mastery_counts["mastered"] += 1
-            
-            # Calculate overall accuracy
-            overall_accuracy = total_correct / total_quiz_attempts if total_quiz_attempts > 0 else 0.0
-            
-            # Calculate recent sessions stats
-            recent_sessions = sessions_response.data
-            recent_sessions_count = len(recent_sessions)
             
-            total_recent_duration = sum(session.get("session_duration", 0) for session in recent_sessions)
-            average_session_duration = total_recent_duration / recent_sessions_count if recent_sessions_count > 0 else 0.0
+            # Fetch the user statistics record, mastery buckets, recent study session totals (last 30 days)
+            # and study streak concurrently; none of them depend on each other
+            user_stats_response, mastery_response, sessions_response, study_streak = await asyncio.gather(
+                run_query(self.supabase.table("user_statistics").select("study_time_minutes, total_quiz_attempts, total_correct_answers").eq("user_id", str(user_id))),
+                run_query(self.supabase.rpc("user_mastery_counts", {"uid": str(user_id)})),
+                run_query(self.supabase.rpc("recent_session_totals", {"uid": str(user_id), "since": thirty_days_ago.isoformat()})),
+                self._calculate_study_streak(user_id)
+            )
             
-            # Calculate study streak (simplified - consecutive days with sessions)
-            study_streak = await self._calculate_study_streak(user_id)
+            # Session count and duration are summed in Postgres, so max-rows can't truncate them
+            recent_sessions = sessions_response.data[0]
             
-            return LearningStats(
-                total_study_time_minutes=total_study_time,
-                total_cards_studied=total_cards_studied,
-                total_quiz_attempts=total_quiz_attempts,
-                total_correct_answers=total_correct,
-                overall_accuracy=overall_accuracy,
-                study_streak_days=study_streak,
-                cards_by_mastery=mastery_counts,
-                recent_sessions_count=recent_sessions_count,
-                average_session_duration=average_session_duration
+            stats = self._build_overview_stats(
+                user_stats_response.data[0] if user_stats_response.data else None,
+                mastery_response.data,
+                recent_sessions["sessions"],
+                recent_sessions["duration"],
+                study_streak
             )
+            statistics_cache.set(cache_key, stats)
+            
+            return stats
             
-        except Exception as e:
-            print(f"Error getting user overview stats: {e}")
+        except Exception:
+            logger.exception("Error getting user overview stats")
             return LearningStats(
                 total_study_time_minutes=0,
                 total_cards_studied=0,
@@ -138,186 +122,221 @@ class StatisticsService:
                 average_session_duration=0.0
             )
     
-    async def get_deck_statistics(self, user_id: uuid.UUID, deck_id: uuid.UUID) -> Optional[DeckStats]:
-        """Get statistics for a specific deck"""
+    def _build_overview_stats(
+        self,
+        user_stats: Optional[Dict[str, Any]],
+        mastery_buckets: List[Dict[str, Any]],
+        recent_sessions_count: int,
+        total_recent_duration: int,
+        study_streak: int
+    ) -> LearningStats:
+        """Build LearningStats from the user statistics row, mastery buckets and recent session totals"""
         
-        try:
-            # Get deck information
-            deck_response = self.supabase.table("decks").select("*").eq("id", str(deck_id)).eq("user_id", str(user_id)).execute()
-            
-            if not deck_response.data:
-                return None
-            
-            deck_data = deck_response.data[0]
-            
-            # Get all cards in the deck
-            cards_response = self.supabase.table("cards").select("id").eq("deck_id", str(deck_id)).execute()
-            
-            total_cards = len(cards_response.data)
-            card_ids = [card["id"] for card in cards_response.data]
-            
-            if not card_ids:
-                return DeckStats(
-                    deck_id=str(deck_id),
-                    deck_name=deck_data["name"],
-                    total_cards=0,
-                    cards_studied=0,
-                    study_progress_percentage=0.0,
-                    mastery_distribution={"new": 0, "learning": 0, "review": 0, "mastered": 0},
-                    average_accuracy=0.0,
-                    total_study_time_minutes=0,
-                    last_studied_at=None
-                )
-            
-            # Get user progress for all cards in the deck
-            progress_data = []
-            for card_id in card_ids:
-                progress_response = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).eq("card_id", card_id).execute()
-                
-                if progress_response.data:
-                    progress_data.append(progress_response.data[0])
-            
-            # Calculate statistics
-            cards_studied = len(progress_data)
-            study_progress_percentage = (cards_studied / total_cards) * 100 if total_cards > 0 else 0.0
-            
-            # Mastery distribution
-            mastery_counts = {"new": 0, "learning": 0, "review": 0, "mastered": 0}
-            total_attempts = 0
+        # Calculate statistics
+        if user_stats:
+            total_study_time = user_stats.get("study_time_minutes", 0)
+            total_quiz_attempts = user_stats.get("total_quiz_attempts", 0)
+            total_correct = user_stats.get("total_correct_answers", 0)
+        else:
+            total_study_time = 0
+            total_quiz_attempts = 0
             total_correct = 0
-            
-            for progress in progress_data:
-                mastery_level = progress.get("mastery_level", 0)
-                if mastery_level == 0:
-                    mastery_counts["new"] += 1
-                elif mastery_level == 1:
-                    mastery_counts["learning"] += 1
-                elif mastery_level == 2:
-                    mastery_counts["review"] += 1
-                else:
-                    mastery_counts["mastered"] += 1
-                
-                attempts = progress.get("quiz_attempts", 0)
-                correct = progress.get("quiz_correct", 0)
-                total_attempts += attempts
-                total_correct += correct
-            
-            # Add unstudied cards to "new"
-            unstudied_cards = total_cards - cards_studied
-            mastery_counts["new"] += unstudied_cards
-            
-            # Calculate average accuracy
-            average_accuracy = total_correct / total_attempts if total_attempts > 0 else 0.0
-            
-            # Get deck study time and last studied
-            total_study_time_minutes = deck_data.get("total_study_time", 0) // 60  # Convert from seconds
-            
-            last_studied_str = deck_data.get("last_studied_at")
-            last_studied_at = None
-            if last_studied_str:
-                try:
-                    last_studied_at = datetime.fromisoformat(last_studied_str.replace('Z', '+00:00'))
-                except Exception:
-                    pass
-            
-            return DeckStats(
-                deck_id=str(deck_id),
-                deck_name=deck_data["name"],
-                total_cards=total_cards,
-                cards_studied=cards_studied,
-                study_progress_percentage=study_progress_percentage,
-                mastery_distribution=mastery_counts,
-                average_accuracy=average_accuracy,
-                total_study_time_minutes=total_study_time_minutes,
-                last_studied_at=last_studied_at
+        
+        # Mastery distribution, bucketed in Postgres
+        mastery_counts, _, _ = self._mastery_from_buckets(mastery_buckets)
+        total_cards_studied = sum(mastery_counts.values())
+        
+        # Calculate overall accuracy
+        overall_accuracy = total_correct / total_quiz_attempts if total_quiz_attempts > 0 else 0.0
+        
+        average_session_duration = total_recent_duration / recent_sessions_count if recent_sessions_count > 0 else 0.0
+        
+        return LearningStats(
+            total_study_time_minutes=total_study_time,
+            total_cards_studied=total_cards_studied,
+            total_quiz_attempts=total_quiz_attempts,
+            total_correct_answers=total_correct,
+            overall_accuracy=overall_accuracy,
+            study_streak_days=study_streak,
+            cards_by_mastery=mastery_counts,
+            recent_sessions_count=recent_sessions_count,
+            average_session_duration=average_session_duration
+        )
+    
+    async def get_deck_statistics(
+        self,
+        user_id: uuid.UUID,
+        deck_id: uuid.UUID,
+        *,
+        deck_data: Optional[Dict[str, Any]] = None
+    ) -> Optional[DeckStats]:
+        """Get statistics for a specific deck; pass an already-fetched deck row as deck_data to skip the lookup"""
+        
+        cache_key = (str(user_id), "deck", str(deck_id))
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Fetch the deck's card count, the user's mastery buckets for it and, unless
+            # the caller already has it, the deck itself concurrently
+            queries = [
+                self.supabase.table("cards").select("id", count="exact", head=True).eq("deck_id", str(deck_id)),
+                self.supabase.rpc("user_mastery_counts", {"uid": str(user_id), "deck": str(deck_id)})
+            ]
+            if deck_data is None:
+                queries.append(self.supabase.table("decks").select(DECK_STATS_COLUMNS).eq("id", str(deck_id)).eq("user_id", str(user_id)))
+            
+            cards_response, mastery_response, *deck_responses = await gather_queries(queries)
+            
+            if deck_data is None:
+                if not deck_responses[0].data:
+                    return None
+                deck_data = deck_responses[0].data[0]
+            
+            stats = self._build_deck_stats(
+                deck_data,
+                cards_response.count or 0,
+                *self._mastery_from_buckets(mastery_response.data)
             )
+            statistics_cache.set(cache_key, stats)
+            
+            return stats
             
-        except Exception as e:
-            print(f"Error getting deck statistics: {e}")
+        except Exception:
+            logger.exception("Error getting deck statistics")
             return None
     
+    def _mastery_from_buckets(self, buckets: List[Dict[str, Any]]) -> Tuple[Dict[str, int], int, int]:
+        """Map user_mastery_counts rows to (mastery_counts, total_attempts, total_correct)"""
+        
+        mastery_counts = {"new": 0, "learning": 0, "review": 0, "mastered": 0}
+        total_attempts = 0
+        total_correct = 0
+        
+        for row in buckets:
+            mastery_counts[row["bucket"]] = row["cnt"]
+            total_attempts += row["attempts"]
+            total_correct += row["correct"]
+        
+        return mastery_counts, total_attempts, total_correct
+    
+    def _mastery_from_deck_row(self, row: Dict[str, Any]) -> Tuple[Dict[str, int], int, int]:
+        """Map a deck_statistics row to (mastery_counts, total_attempts, total_correct)"""
+        
+        mastery_counts = {
+            "new": row["new_cards"],
+            "learning": row["learning_cards"],
+            "review": row["review_cards"],
+            "mastered": row["mastered_cards"]
+        }
+        
+        return mastery_counts, row["attempts"], row["correct"]
+    
+    def _build_deck_stats(
+        self,
+        deck_data: Dict[str, Any],
+        total_cards: int,
+        mastery_counts: Dict[str, int],
+        total_attempts: int,
+        total_correct: int
+    ) -> DeckStats:
+        """Build DeckStats from a deck row and the user's mastery buckets for its cards"""
+        
+        # Calculate statistics
+        cards_studied = sum(mastery_counts.values())
+        study_progress_percentage = (cards_studied / total_cards) * 100 if total_cards > 0 else 0.0
+        
+        # Add unstudied cards to "new"
+        unstudied_cards = total_cards - cards_studied
+        mastery_counts["new"] += unstudied_cards
+        
+        # Calculate average accuracy
+        average_accuracy = total_correct / total_attempts if total_attempts > 0 else 0.0
+        
+        # Get deck study time and last studied (only meaningful once the deck has cards)
+        total_study_time_minutes = 0
+        last_studied_at = None
+        if total_cards > 0:
+            total_study_time_minutes = deck_data.get("total_study_time", 0) // 60  # Convert from seconds
+            last_studied_at = parse_timestamp(deck_data.get("last_studied_at"))
+        
+        return DeckStats(
+            deck_id=str(deck_data["id"]),
+            deck_name=deck_data["name"],
+            total_cards=total_cards,
+            cards_studied=cards_studied,
+            study_progress_percentage=study_progress_percentage,
+            mastery_distribution=mastery_counts,
+            average_accuracy=average_accuracy,
+            total_study_time_minutes=total_study_time_minutes,
+            last_studied_at=last_studied_at
+        )
+    
     async def get_all_deck_statistics(self, user_id: uuid.UUID) -> List[DeckStats]:
         """Get statistics for all user decks"""
         
+        cache_key = (str(user_id), "all_decks")
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Get all user decks
-            decks_response = self.supabase.table("decks").select("id, name").eq("user_id", str(user_id)).execute()
+            # Card totals and mastery buckets for every deck, aggregated in Postgres
+            # so large decks aren't truncated by PostgREST's max-rows cap
+            decks_response = await run_query(self.supabase.rpc("deck_statistics", {"uid": str(user_id)}))
             
-            deck_stats = []
-            for deck in decks_response.data:
-                stats = await self.get_deck_statistics(user_id, uuid.UUID(deck["id"]))
-                if stats:
-                    deck_stats.append(stats)
+            deck_stats = [
+                self._build_deck_stats(deck, deck["total_cards"], *self._mastery_from_deck_row(deck))
+                for deck in decks_response.data
+            ]
+            statistics_cache.set(cache_key, deck_stats)
             
             return deck_stats
             
-        except Exception as e:
-            print(f"Error getting all deck statistics: {e}")
+        except Exception:
+            logger.exception("Error getting all deck statistics")
             return []
     
     async def get_difficult_cards(self, user_id: uuid.UUID, limit: int = 20) -> List[CardStats]:
         """Get cards that the user finds most difficult"""
         
         try:
-            # Get all user progress, ordered by difficulty score (descending) and accuracy (ascending)
-            progress_response = self.supabase.table("user_card_progress").select("*").eq("user_id", str(user_id)).gte("quiz_attempts", 2).execute()
-            
-            # Calculate difficulty and get card details
-            card_stats = []
-            
-            for progress in progress_response.data:
-                card_id = progress["card_id"]
-                
-                # Get card details
-                card_response = self.supabase.table("cards").select("*").eq("id", card_id).execute()
-                
-                if card_response.data:
-                    card_data = card_response.data[0]
-                    
-                    quiz_attempts = progress.get("quiz_attempts", 0)
-                    quiz_correct = progress.get("quiz_correct", 0)
-                    accuracy_rate = quiz_correct / quiz_attempts if quiz_attempts > 0 else 0.0
-                    
-                    # Parse dates
-                    first_studied = None
-                    last_studied = None
-                    
-                    if progress.get("first_flipped_at"):
-                        try:
-                            first_studied = datetime.fromisoformat(progress["first_flipped_at"].replace('Z', '+00:00'))
-                        except Exception:
-                            pass
-                    
-                    if progress.get("last_quiz_attempt_at"):
-                        try:
-                            last_studied = datetime.fromisoformat(progress["last_quiz_attempt_at"].replace('Z', '+00:00'))
-                        except Exception:
-                            pass
-                    
-                    card_stat = CardStats(
-                        card_id=card_id,
-                        hanzi=card_data["hanzi"],
-                        pinyin=card_data["pinyin"],
-                        english=card_data["english"],
-                        mastery_level=progress.get("mastery_level", 0),
-                        difficulty_score=progress.get("difficulty_score", 1.0),
-                        quiz_attempts=quiz_attempts,
-                        quiz_correct=quiz_correct,
-                        accuracy_rate=accuracy_rate,
-                        first_studied=first_studied,
-                        last_studied=last_studied,
-                        study_time_seconds=progress.get("total_study_time", 0)
-                    )
-                    
-                    card_stats.append(card_stat)
-            
-            # Sort by difficulty (low accuracy, high difficulty score)
-            card_stats.sort(key=lambda x: (x.accuracy_rate, -x.difficulty_score))
+            # Rank by difficulty (low accuracy, high difficulty score) and limit in Postgres
+            difficult_response = (
+                self.supabase.table("v_difficult_cards")
+                .select(
+                    "card_id, hanzi, pinyin, english, mastery_level, difficulty_score, quiz_attempts, "
+                    "quiz_correct, accuracy_rate, first_flipped_at, last_quiz_attempt_at, total_study_time"
+                )
+                .eq("user_id", str(user_id))
+                .gte("quiz_attempts", 2)
+                .order("accuracy_rate")
+                .order("difficulty_score", desc=True)
+                .limit(limit)
+                .execute()
+            )
             
-            return card_stats[:limit]
+            return [
+                CardStats(
+                    card_id=row["card_id"],
+                    hanzi=row["hanzi"],
+                    pinyin=row["pinyin"],
+                    english=row["english"],
+                    mastery_level=row.get("mastery_level", 0),
+                    difficulty_score=row.get("difficulty_score", 1.0),
+                    quiz_attempts=row.get("quiz_attempts", 0),
+                    quiz_correct=row.get("quiz_correct", 0),
+                    accuracy_rate=row.get("accuracy_rate", 0.0),
+                    first_studied=parse_timestamp(row.get("first_flipped_at")),
+                    last_studied=parse_timestamp(row.get("last_quiz_attempt_at")),
+                    study_time_seconds=row.get("total_study_time", 0)
+                )
+                for row in difficult_response.data
+            ]
             
-        except Exception as e:
-            print(f"Error getting difficult cards: {e}")
+        except Exception:
+            logger.exception("Error getting difficult cards")
             return []
     
     async def get_learning_progress_over_time(self, user_id: uuid.UUID, days: int = 30) -> Dict[str, List]:
@@ -326,82 +345,13 @@ class StatisticsService:
         try:
             start_date = datetime.utcnow() - timedelta(days=days)
             
-            # Get study sessions over the period
-            sessions_response = self.supabase.table("study_sessions").select("*").eq("user_id", str(user_id)).gte("created_at", start_date.isoformat()).order("created_at").execute()
-            
-            # Group by date
-            daily_stats = {}
-            
-            for session in sessions_response.data:
-                try:
-                    session_date = datetime.fromisoformat(session["created_at"].replace('Z', '+00:00')).date()
-                    date_str = session_date.isoformat()
-                    
-                    if date_str not in daily_stats:
-                        daily_stats[date_str] = {
-                            "sessions": 0,
-                            "cards_studied": 0,
-                            "correct_answers": 0,
-                            "total_attempts": 0,
-                            "study_time_minutes": 0
-                        }
-                    
-                    daily_stats[date_str]["sessions"] += 1
-                    daily_stats[date_str]["cards_studied"] += session.get("cards_studied", 0)
-                    daily_stats[date_str]["correct_answers"] += session.get("correct_answers", 0)
-                    daily_stats[date_str]["study_time_minutes"] += session.get("session_duration", 0)
-                    
-                    # Approximate total attempts (assuming roughly equal to cards studied for simplicity)
-                    daily_stats[date_str]["total_attempts"] += session.get("cards_studied", 0)
-                    
-                except Exception:
-                    continue
-            
-            # Convert to lists for charting
-            dates = []
-            sessions_count = []
-            accuracy_rates = []
-            study_times = []
-            cards_studied = []
+            # Get per-day session totals over the period, aggregated in Postgres
+            daily_response = await run_query(self.supabase.rpc("daily_learning_progress", {"uid": str(user_id), "since": start_date.isoformat()}))
             
-            # Fill in all days (including zero days)
-            current_date = start_date.date()
-            end_date = datetime.utcnow().date()
+            return self._build_progress_series(daily_response.data, start_date)
             
-            while current_date <= end_date:
-                date_str = current_date.isoformat()
-                dates.append(date_str)
-                
-                if date_str in daily_stats:
-                    stats = daily_stats[date_str]
-                    sessions_count.append(stats["sessions"])
-                    study_times.append(stats["study_time_minutes"])
-                    cards_studied.append(stats["cards_studied"])
-                    
-                    # Calculate accuracy
-                    if stats["total_attempts"] > 0:
-                        accuracy = stats["correct_answers"] / stats["total_attempts"]
-                        accuracy_rates.append(accuracy * 100)  # Convert to percentage
-                    else:
-                        accuracy_rates.append(0)
-                else:
-                    sessions_count.append(0)
-                    accuracy_rates.append(0)
-                    study_times.append(0)
-                    cards_studied.append(0)
-                
-                current_date += timedelta(days=1)
-            
-            return {
-                "dates": dates,
-                "sessions": sessions_count,
-                "accuracy_rates": accuracy_rates,
-                "study_times": study_times,
-                "cards_studied": cards_studied
-            }
-            
-        except Exception as e:
-            print(f"Error getting learning progress over time: {e}")
+        except Exception:
+            logger.exception("Error getting learning progress over time")
             return {
                 "dates": [],
                 "sessions": [],
@@ -410,54 +360,96 @@ class StatisticsService:
                 "cards_studied": []
             }
     
-    async def _calculate_study_streak(self, user_id: uuid.UUID) -> int:
-        """Calculate consecutive days of study"""
+    async def get_dashboard(self, user_id: uuid.UUID, days: int = 30) -> Dict[str, Any]:
+        """Get overview, per-deck statistics and the daily progress series in one round-trip"""
+        
+        cache_key = (str(user_id), "dashboard", days)
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            # Get recent study sessions
-            sessions_response = self.supabase.table("study_sessions").select("created_at").eq("user_id", str(user_id)).order("created_at", desc=True).execute()
-            
-            if not sessions_response.data:
-                return 0
-            
-            # Group sessions by date
-            study_dates = set()
-            
-            for session in sessions_response.data:
-                try:
-                    session_date = datetime.fromisoformat(session["created_at"].replace('Z', '+00:00')).date()
-                    study_dates.add(session_date)
-                except Exception:
-                    continue
-            
-            if not study_dates:
-                return 0
+            start_date = datetime.utcnow() - timedelta(days=days)
             
-            # Calculate streak
-            study_dates_list = sorted(list(study_dates), reverse=True)
-            current_date = datetime.utcnow().date()
+            dashboard_response = await run_query(self.supabase.rpc("dashboard", {"uid": str(user_id), "days": days}))
+            data = dashboard_response.data
+            overview = data["overview"]
+            
+            dashboard = {
+                "overview": self._build_overview_stats(
+                    overview["user_statistics"],
+                    overview["mastery"],
+                    overview["recent_sessions_count"],
+                    overview["recent_sessions_duration"],
+                    overview["study_streak"] or 0
+                ),
+                "decks": [
+                    self._build_deck_stats(deck, deck["total_cards"], deck["mastery"], deck["attempts"], deck["correct"])
+                    for deck in data["decks"]
+                ],
+                "progress": self._build_progress_series(data["timeseries"], start_date)
+            }
+            statistics_cache.set(cache_key, dashboard)
             
-            streak = 0
+            return dashboard
             
-            # Check if studied today or yesterday
-            if current_date in study_dates_list:
-                streak += 1
-                check_date = current_date - timedelta(days=1)
-            elif current_date - timedelta(days=1) in study_dates_list:
-                streak += 1
-                check_date = current_date - timedelta(days=2)
-            else:
-                return 0
+        except Exception:
+            logger.exception("Error getting dashboard statistics")
+            return {
+                "overview": self._build_overview_stats(None, [], 0, 0, 0),
+                "decks": [],
+                "progress": {
+                    "dates": [],
+                    "sessions": [],
+                    "accuracy_rates": [],
+                    "study_times": [],
+                    "cards_studied": []
+                }
+            }
+    
+    def _build_progress_series(self, daily_rows: List[Dict[str, Any]], start_date: datetime) -> Dict[str, List]:
+        """Zero-fill daily_learning_progress rows into chart series from start_date through today"""
+        
+        # Fill in all days (including zero days) by reindexing onto the full date axis
+        dates = pd.date_range(start_date.date(), datetime.utcnow().date(), freq="D").strftime("%Y-%m-%d")
+        daily = (
+            pd.DataFrame(daily_rows, columns=["day", *DAILY_PROGRESS_COLUMNS])
+            .set_index("day")
+            .reindex(dates, fill_value=0)
+            .astype("int64")
+        )
+        
+        # Accuracy as a percentage, 0 on days without attempts
+        accuracy_rates = (daily["correct"] / daily["attempts"].where(daily["attempts"] > 0) * 100).fillna(0)
+        
+        # Convert to lists for charting
+        return {
+            "dates": dates.tolist(),
+            "sessions": daily["sessions"].tolist(),
+            "accuracy_rates": accuracy_rates.tolist(),
+            "study_times": daily["study_time"].tolist(),
+            "cards_studied": daily["cards_studied"].tolist()
+        }
+    
+    async def _calculate_study_streak(self, user_id: uuid.UUID) -> int:
+        """Calculate consecutive days of study"""
+        
+        cache_key = (str(user_id), "streak")
+        cached = statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Streak is computed in Postgres from distinct session days
+            streak_response = await run_query(self.supabase.rpc("study_streak", {"uid": str(user_id)}))
             
-            # Count consecutive days
-            while check_date in study_dates_list:
-                streak += 1
-                check_date -= timedelta(days=1)
+            streak = streak_response.data or 0
+            statistics_cache.set(cache_key, streak)
             
             return streak
             
-        except Exception as e:
-            print(f"Error calculating study streak: {e}")
+        except Exception:
+            logger.exception("Error calculating study streak")
             return 0
     
     async def update_user_statistics(
@@ -471,35 +463,20 @@ class StatisticsService:
         """Update user statistics incrementally"""
         
         try:
-            # Get current stats
-            stats_response = self.supabase.table("user_statistics").select("*").eq("user_id", str(user_id)).execute()
-            
-            if stats_response.data:
-                # Update existing
-                current_stats = stats_response.data[0]
-                
-                update_data = {
-                    "total_views": current_stats.get("total_views", 0) + additional_views,
-                    "total_correct_answers": current_stats.get("total_correct_answers", 0) + additional_correct_answers,
-                    "total_quiz_attempts": current_stats.get("total_quiz_attempts", 0) + additional_quiz_attempts,
-                    "study_time_minutes": current_stats.get("study_time_minutes", 0) + additional_study_time_minutes
-                }
-                
-                self.supabase.table("user_statistics").update(update_data).eq("user_id", str(user_id)).execute()
-            else:
-                # Create new
-                insert_data = {
-                    "user_id": str(user_id),
-                    "total_views": additional_views,
-                    "total_correct_answers": additional_correct_answers,
-                    "total_quiz_attempts": additional_quiz_attempts,
-                    "study_time_minutes": additional_study_time_minutes
-                }
-                
-                self.supabase.table("user_statistics").insert(insert_data).execute()
+            # Add the deltas in a single atomic upsert
+            await run_query(self.supabase.rpc("increment_user_statistics", {
+                "uid": str(user_id),
+                "dt": additional_study_time_minutes,
+                "dv": additional_views,
+                "da": additional_quiz_attempts,
+                "dc": additional_correct_answers
+            }))
+            
+            # Drop this user's cached overview, deck and streak statistics
+            statistics_cache.pop_prefix((str(user_id),))
             
             return True
             
-        except Exception as e:
-            print(f"Error updating user statistics: {e}")
+        except Exception:
+            logger.exception("Error updating user statistics")
             return False
\ No newline at end of file
@@ -1,12 +1,13 @@
 """
 Study session service for managing learning sessions and progress tracking
 """
+import logging
 import uuid
 import random
-from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from supabase import Client
 
+from app.core.cache import deck_cards_cache
 from app.services.learning_service import LearningAlgorithm
 from app.services.card_service import CardService
 from app.schemas.schemas import (
@@ -18,17 +19,53 @@ from app.schemas.schemas import (
     QuizQuestionResponse,
     QuizAnswerRequest,
     QuizAnswerResponse,
-    CardWithProgress
+    CardWithProgress,
+    CardResponse,
+    InteractionType
 )
 
+logger = logging.getLogger(__name__)
+
+# Most interactions accepted by record_card_interactions; each batch becomes one
+# insert, one IN filter over its card ids and one upsert
+MAX_INTERACTION_BATCH_SIZE = 100
+
+
+def _english_of(card: CardResponse) -> str:
+    return card.english
+
+
+def _chinese_of(card: CardResponse) -> str:
+    return f"{card.hanzi} ({card.pinyin})"
+
+
+def _ask_meaning(card: CardResponse) -> str:
+    return f"What does '{card.hanzi}' ({card.pinyin}) mean?"
+
+
+def _ask_chinese(card: CardResponse) -> str:
+    return f"How do you say '{card.english}' in Chinese?"
+
+
+# (answer formatter, question formatter) per quiz direction
+_QUIZ_FORMATS = {
+    "chinese_to_english": (_english_of, _ask_meaning),
+    "english_to_chinese": (_chinese_of, _ask_chinese)
+}
+
 
 class StudySessionService:
     """Service for managing study sessions"""
     
     def __init__(self, supabase_client: Client):
         self.supabase = supabase_client
+        # Request builders are stateless per table, so build them once per service
+        self._sessions = supabase_client.table("study_sessions")
+        self._interactions = supabase_client.table("card_interactions")
         self.learning_algorithm = LearningAlgorithm(supabase_client)
         self.card_service = CardService(supabase_client)
+        # Private generator for quiz options, seeded from os.urandom
+        self._rng = random.Random()
     
     async def create_study_session(
         self, 
@@ -44,19 +81,18 @@ class StudySessionService:
                 "direction": session_create.direction,
                 "cards_studied": 0,
                 "correct_answers": 0,
-                "session_duration": 0,
-                "created_at": datetime.utcnow().isoformat()
+                "session_duration": 0
             }
             
-            response = self.supabase.table("study_sessions").insert(session_data).execute()
+            response = self._sessions.insert(session_data).execute()
             
             if response.data:
                 return StudySessionResponse(**response.data[0])
             
             return None
             
-        except Exception as e:
-            print(f"Error creating study session: {e}")
+        except Exception:
+            logger.exception("Error creating study session")
             return None
     
     async def get_study_session(
@@ -67,38 +103,56 @@ class StudySessionService:
         """Get study session by ID"""
         
         try:
-            response = self.supabase.table("study_sessions").select("*").eq("id", str(session_id)).eq("user_id", str(user_id)).execute()
+            response = self._sessions.select("*").eq("id", str(session_id)).eq("user_id", str(user_id)).execute()
             
             if response.data:
                 return StudySessionResponse(**response.data[0])
             
             return None
             
-        except Exception as e:
-            print(f"Error getting study session: {e}")
+        except Exception:
+            logger.exception("Error getting study session")
             return None
     
+    async def _get_session_deck_id(
+        self,
+        session_id: uuid.UUID,
+        user_id: uuid.UUID
+    ) -> Optional[uuid.UUID]:
+        """Look up a session's deck for internal use, without building a full response model"""
+        
+        response = self._sessions.select("deck_id").eq("id", str(session_id)).eq("user_id", str(user_id)).execute()
+        
+        if response.data:
+            return uuid.UUID(response.data[0]["deck_id"])
+        
+        return None
+    
     async def update_study_session(
         self,
         session_id: uuid.UUID,
         user_id: uuid.UUID,
         session_update: StudySessionUpdate
     ) -> Optional[StudySessionResponse]:
-        """Update study session progress"""
+        """Update study session progress; returns None when there is nothing to update"""
         
         try:
             update_data = session_update.dict(exclude_unset=True)
             
-            if update_data:
-                response = self.supabase.table("study_sessions").update(update_data).eq("id", str(session_id)).eq("user_id", str(user_id)).execute()
-                
-                if response.data:
-                    return StudySessionResponse(**response.data[0])
+            # Callers that want the current state on a no-op use get_study_session
+            if not update_data:
+                return None
+            
+            response = self._sessions.update(update_data).eq("id", str(session_id)).eq("user_id", str(user_id)).execute()
+            
+            if response.data:
+                return StudySessionResponse(**response.data[0])
             
-            return await self.get_study_session(session_id, user_id)
+            # No row matched, so a re-read with the same filters would find nothing either
+            return None
             
-        except Exception as e:
-            print(f"Error updating study session: {e}")
+        except Exception:
+            logger.exception("Error updating study session")
             return None
     
     async def end_study_session(
@@ -110,19 +164,16 @@ class StudySessionService:
         """End a study session and update final statistics"""
         
         try:
-            # Get current session data
-            session = await self.get_study_session(session_id, user_id)
-            if not session:
-                return None
-            
-            # Update session with final data
+            # Update session with final data; the user filter also checks ownership
             update_data = {
                 "session_duration": final_duration_minutes
             }
             
-            response = self.supabase.table("study_sessions").update(update_data).eq("id", str(session_id)).eq("user_id", str(user_id)).execute()
+            response = self._sessions.update(update_data).eq("id", str(session_id)).eq("user_id", str(user_id)).execute()
             
             if response.data:
+                session = StudySessionResponse(**response.data[0])
+                
                 # Update deck study time
                 from app.services.deck_service import DeckService
                 deck_service = DeckService(self.supabase)
@@ -131,12 +182,12 @@ class StudySessionService:
                     final_duration_minutes * 60  # Convert to seconds
                 )
                 
-                return StudySessionResponse(**response.data[0])
+                return session
             
             return None
             
-        except Exception as e:
-            print(f"Error ending study session: {e}")
+        except Exception:
+            logger.exception("Error ending study session")
             return None
     
     async def get_study_cards(
@@ -148,31 +199,23 @@ class StudySessionService:
         """Get cards for study session using adaptive algorithm"""
         
         try:
-            # Get session info
-            session = await self.get_study_session(session_id, user_id)
-            if not session:
+            # Get the session's deck, which also checks ownership
+            deck_id = await self._get_session_deck_id(session_id, user_id)
+            if not deck_id:
                 return []
             
             # Use learning algorithm to select cards
             selected_card_ids = await self.learning_algorithm.select_cards_for_study(
                 user_id=user_id,
-                deck_id=session.deck_id,
+                deck_id=deck_id,
                 target_count=count
             )
             
             # Get full card data with progress
-            cards = []
-            for card_id in selected_card_ids:
-                card = await self.card_service.get_card_with_progress(
-                    uuid.UUID(card_id), user_id
-                )
-                if card:
-                    cards.append(card)
+            return await self.card_service.get_cards_with_progress(selected_card_ids, user_id)
             
-            return cards
-            
-        except Exception as e:
-            print(f"Error getting study cards: {e}")
+        except Exception:
+            logger.exception("Error getting study cards")
             return []
     
     async def record_card_interaction(
@@ -187,13 +230,12 @@ class StudySessionService:
                 "session_id": str(interaction.session_id),
                 "user_id": str(user_id),
                 "card_id": str(interaction.card_id),
-                "interaction_type": interaction.interaction_type,
+                "interaction_type": InteractionType.from_label(interaction.interaction_type).value,
                 "direction": interaction.direction,
-                "response_time": interaction.response_time,
-                "created_at": datetime.utcnow().isoformat()
+                "response_time": interaction.response_time
             }
             
-            response = self.supabase.table("card_interactions").insert(interaction_data).execute()
+            response = self._interactions.insert(interaction_data).execute()
             
             if response.data:
                 # Update user card progress using learning algorithm
@@ -213,10 +255,70 @@ class StudySessionService:
             
             return None
             
-        except Exception as e:
-            print(f"Error recording card interaction: {e}")
+        except Exception:
+            logger.exception("Error recording card interaction")
             return None
     
+    async def record_card_interactions(
+        self,
+        interactions: List[CardInteractionCreate],
+        user_id: uuid.UUID
+    ) -> List[CardInteractionResponse]:
+        """Record several card interactions with one insert and one progress update"""
+        
+        try:
+            if not interactions:
+                return []
+            
+            user_id_str = str(user_id)
+            interaction_data = [
+                {
+                    "session_id": str(interaction.session_id),
+                    "user_id": user_id_str,
+                    "card_id": str(interaction.card_id),
+                    "interaction_type": InteractionType.from_label(interaction.interaction_type).value,
+                    "direction": interaction.direction,
+                    "response_time": interaction.response_time
+                }
+                for interaction in interactions
+            ]
+            
+            response = self._interactions.insert(interaction_data).execute()
+            
+            if response.data:
+                # Update user card progress using learning algorithm, in interaction order.
+                # The interactions are already stored, so a failed progress write is logged
+                # rather than reported back where a client retry would record them twice
+                progress_updated = await self.learning_algorithm.update_card_progresses(
+                    user_id=user_id,
+                    interactions=[(interaction.card_id, interaction.interaction_type) for interaction in interactions]
+                )
+                if not progress_updated:
+                    logger.error(
+                        "Recorded %d interactions for user %s but could not update their card progress",
+                        len(interactions), user_id
+                    )
+                
+                return [CardInteractionResponse(**row) for row in response.data]
+            
+            return []
+            
+        except Exception:
+            logger.exception("Error recording card interactions")
+            return []
+    
+    async def _get_deck_cards(self, deck_id: uuid.UUID) -> List[CardResponse]:
+        """Get a deck's cards, reusing the list across questions of a session"""
+        
+        deck_cards = deck_cards_cache.get(str(deck_id))
+        if deck_cards is None:
+            deck_cards = await self.card_service.get_deck_cards(deck_id)
+            # An empty list may be a swallowed query error, so don't pin it
+            if deck_cards:
+                deck_cards_cache.set(str(deck_id), deck_cards)
+        
+        return deck_cards
+    
     async def generate_quiz_question(
         self,
         card_id: uuid.UUID,
@@ -227,24 +329,27 @@ class StudySessionService:
         """Generate a multiple choice quiz question"""
         
         try:
-            # Get the target card
-            target_card = await self.card_service.get_card_by_id(card_id)
-            if not target_card:
-                return None
-            
-            # Get other cards from the same deck for incorrect options
-            deck_cards = await self.card_service.get_deck_cards(deck_id)
-            other_cards = [card for card in deck_cards if card.id != card_id]
-            
-            if len(other_cards) < 3:
+            # Take the target card from the deck list, which is usually cached,
+            # and only fetch it separately when it isn't in that list
+            deck_cards = await self._get_deck_cards(deck_id)
+            target_card = next((card for card in deck_cards if card.id == card_id), None)
+            if target_card is None:
+                target_card = await self.card_service.get_card_by_id(card_id)
+                if not target_card:
+                    return None
+            
+            # Any direction other than chinese_to_english quizzes the Chinese side
+            answer_of, question_of = _QUIZ_FORMATS.get(direction, _QUIZ_FORMATS["english_to_chinese"])
+            question = question_of(target_card)
+            correct_answer = answer_of(target_card)
+            
+            # Pick incorrect options from the same deck by index: four distinct
+            # draws always leave three that aren't the target card
+            sampled = self._rng.sample(range(len(deck_cards)), min(4, len(deck_cards)))
+            incorrect_options = [deck_cards[i] for i in sampled if deck_cards[i].id != card_id][:3]
+            
+            if len(incorrect_options) < 3:
                 # Not enough cards for multiple choice, return simple question
-                if direction == "chinese_to_english":
-                    question = f"What does '{target_card.hanzi}' ({target_card.pinyin}) mean?"
-                    correct_answer = target_card.english
-                else:
-                    question = f"How do you say '{target_card.english}' in Chinese?"
-                    correct_answer = f"{target_card.hanzi} ({target_card.pinyin})"
-                
                 return QuizQuestionResponse(
                     card_id=card_id,
                     question=question,
@@ -253,25 +358,9 @@ class StudySessionService:
                     direction=direction
                 )
             
-            # Generate multiple choice options
-            if direction == "chinese_to_english":
-                question = f"What does '{target_card.hanzi}' ({target_card.pinyin}) mean?"
-                correct_answer = target_card.english
-                
-                # Get 3 random incorrect options
-                incorrect_options = random.sample(other_cards, min(3, len(other_cards)))
-                options = [correct_answer] + [card.english for card in incorrect_options]
-                
-            else:  # english_to_chinese
-                question = f"How do you say '{target_card.english}' in Chinese?"
-                correct_answer = f"{target_card.hanzi} ({target_card.pinyin})"
-                
-                # Get 3 random incorrect options
-                incorrect_options = random.sample(other_cards, min(3, len(other_cards)))
-                options = [correct_answer] + [f"{card.hanzi} ({card.pinyin})" for card in incorrect_options]
-            
-            # Shuffle options
-            random.shuffle(options)
+            # Generate multiple choice options, placing the correct one at a random position
+            options = [answer_of(card) for card in incorrect_options]
+            options.insert(self._rng.randrange(len(options) + 1), correct_answer)
             
             return QuizQuestionResponse(
                 card_id=card_id,
@@ -281,8 +370,8 @@ class StudySessionService:
                 direction=direction
             )
             
-        except Exception as e:
-            print(f"Error generating quiz question: {e}")
+        except Exception:
+            logger.exception("Error generating quiz question")
             return None
     
     async def submit_quiz_answer(
@@ -294,62 +383,36 @@ class StudySessionService:
         """Submit and evaluate a quiz answer"""
         
         try:
-            # Get the correct answer by regenerating the question
-            session = await self.get_study_session(session_id, user_id)
-            if not session:
-                return None
-            
-            question = await self.generate_quiz_question(
-                card_id=answer.card_id,
-                deck_id=session.deck_id,
-                direction=session.direction,
-                user_id=user_id
-            )
-            
-            if not question:
+            # Check the answer, record the interaction and update the session counters in one call
+            response = self.supabase.rpc("submit_quiz_answer", {
+                "p_session_id": str(session_id),
+                "p_user_id": str(user_id),
+                "p_card_id": str(answer.card_id),
+                "p_selected": answer.selected_answer,
+                "p_response_time": answer.response_time
+            }).execute()
+            
+            result = response.data
+            if not result:
                 return None
             
-            # Check if answer is correct
-            is_correct = answer.selected_answer.strip().lower() == question.correct_answer.strip().lower()
-            
-            # Record the interaction
-            interaction = CardInteractionCreate(
-                session_id=session_id,
+            # Update user card progress using learning algorithm
+            await self.learning_algorithm.update_card_progress(
+                user_id=user_id,
                 card_id=answer.card_id,
-                interaction_type="quiz_correct" if is_correct else "quiz_incorrect",
-                direction=session.direction,
+                interaction_type="quiz_correct" if result["correct"] else "quiz_incorrect",
+                is_correct=result["correct"],
                 response_time=answer.response_time
             )
             
-            await self.record_card_interaction(interaction, user_id)
-            
-            # Update session statistics
-            current_session = await self.get_study_session(session_id, user_id)
-            if current_session:
-                update_data = StudySessionUpdate(
-                    cards_studied=current_session.cards_studied + 1,
-                    correct_answers=current_session.correct_answers + (1 if is_correct else 0)
-                )
-                await self.update_study_session(session_id, user_id, update_data)
-            
-            # Generate explanation
-            explanation = None
-            if not is_correct:
-                card = await self.card_service.get_card_by_id(answer.card_id)
-                if card:
-                    if session.direction == "chinese_to_english":
-                        explanation = f"'{card.hanzi}' ({card.pinyin}) means '{card.english}'"
-                    else:
-                        explanation = f"'{card.english}' is '{card.hanzi}' ({card.pinyin}) in Chinese"
-            
             return QuizAnswerResponse(
-                correct=is_correct,
-                correct_answer=question.correct_answer,
-                explanation=explanation
+                correct=result["correct"],
+                correct_answer=result["correct_answer"],
+                explanation=result.get("explanation")
             )
             
-        except Exception as e:
-            print(f"Error submitting quiz answer: {e}")
+        except Exception:
+            logger.exception("Error submitting quiz answer")
             return None
     
     async def get_user_study_sessions(
@@ -361,7 +424,7 @@ class StudySessionService:
         """Get user's study sessions"""
         
         try:
-            query = self.supabase.table("study_sessions").select("*").eq("user_id", str(user_id))
+            query = self._sessions.select("*").eq("user_id", str(user_id))
             
             if deck_id:
                 query = query.eq("deck_id", str(deck_id))
@@ -372,8 +435,8 @@ class StudySessionService:
             
             return [StudySessionResponse(**session) for session in response.data]
             
-        except Exception as e:
-            print(f"Error getting user study sessions: {e}")
+        except Exception:
+            logger.exception("Error getting user study sessions")
             return []
     
     async def get_session_statistics(
@@ -389,40 +452,27 @@ class StudySessionService:
             if not session:
                 return {}
             
-            # Get all interactions for this session
-            interactions_response = self.supabase.table("card_interactions").select("*").eq("session_id", str(session_id)).execute()
-            
-            interactions = interactions_response.data
-            
-            # Calculate statistics
-            total_interactions = len(interactions)
-            flip_count = len([i for i in interactions if i["interaction_type"] == "flip"])
-            quiz_interactions = [i for i in interactions if i["interaction_type"].startswith("quiz_")]
-            quiz_correct = len([i for i in quiz_interactions if i["interaction_type"] == "quiz_correct"])
-            quiz_total = len(quiz_interactions)
-            
-            # Calculate average response time for quiz questions
-            quiz_times = [i["response_time"] for i in quiz_interactions if i["response_time"]]
-            avg_response_time = sum(quiz_times) / len(quiz_times) if quiz_times else 0
+            # Aggregate this session's interactions in Postgres
+            stats_response = self.supabase.rpc("session_statistics", {"sid": str(session_id)}).execute()
             
-            # Cards studied
-            unique_cards = set(i["card_id"] for i in interactions)
-            cards_studied = len(unique_cards)
+            stats = stats_response.data[0]
+            quiz_correct = stats["quiz_correct"]
+            quiz_total = stats["quiz_total"]
             
             return {
                 "session_id": str(session_id),
-                "total_interactions": total_interactions,
-                "cards_flipped": flip_count,
+                "total_interactions": stats["total_interactions"],
+                "cards_flipped": stats["flip_count"],
                 "quiz_questions": quiz_total,
                 "quiz_correct": quiz_correct,
                 "quiz_accuracy": quiz_correct / quiz_total if quiz_total > 0 else 0,
-                "unique_cards_studied": cards_studied,
-                "average_response_time_ms": avg_response_time,
+                "unique_cards_studied": stats["unique_cards"],
+                "average_response_time_ms": stats["avg_response_time"],
                 "session_duration_minutes": session.session_duration,
                 "direction": session.direction,
                 "created_at": session.created_at
             }
             
-        except Exception as e:
-            print(f"Error getting session statistics: {e}")
+        except Exception:
+            logger.exception("Error getting session statistics")
             return {}
\ No newline at end of file
@@ -2,6 +2,7 @@
 User service for CRUD operations
 """
 from typing import List, Optional
+import logging
 import uuid
 from datetime import datetime
 from supabase import Client
@@ -13,6 +14,8 @@ from app.schemas.schemas import (
     UserStatisticsResponse
 )
 
+logger = logging.getLogger(__name__)
+
 
 class UserService:
     def __init__(self, supabase_client: Client):
@@ -24,8 +27,8 @@ class UserService:
             response = self.supabase.table("users").select("*").execute()
             
             return [UserResponse(**user) for user in response.data]
-        except Exception as e:
-            print(f"Error getting users: {e}")
+        except Exception:
+            logger.exception("Error getting users")
             return []
     
     async def get_user_by_id(self, user_id: uuid.UUID) -> Optional[UserResponse]:
@@ -36,8 +39,8 @@ class UserService:
             if response.data:
                 return UserResponse(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting user by ID: {e}")
+        except Exception:
+            logger.exception("Error getting user by ID")
             return None
     
     async def get_user_by_username(self, username: str) -> Optional[UserResponse]:
@@ -48,8 +51,8 @@ class UserService:
             if response.data:
                 return UserResponse(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting user by username: {e}")
+        except Exception:
+            logger.exception("Error getting user by username")
             return None
     
     async def update_user(self, user_id: uuid.UUID, user_update: UserUpdate) -> Optional[UserResponse]:
@@ -64,8 +67,8 @@ class UserService:
                     return UserResponse(**response.data[0])
             
             return await self.get_user_by_id(user_id)
-        except Exception as e:
-            print(f"Error updating user: {e}")
+        except Exception:
+            logger.exception("Error updating user")
             return None
     
     async def delete_user(self, user_id: uuid.UUID) -> bool:
@@ -75,8 +78,8 @@ class UserService:
             response = self.supabase.table("users").delete().eq("id", str(user_id)).execute()
             
             return len(response.data) > 0
-        except Exception as e:
-            print(f"Error deleting user: {e}")
+        except Exception:
+            logger.exception("Error deleting user")
             return False
     
     async def get_user_statistics(self, user_id: uuid.UUID) -> Optional[UserStatisticsResponse]:
@@ -87,8 +90,8 @@ class UserService:
             if response.data:
                 return UserStatisticsResponse(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting user statistics: {e}")
+        except Exception:
+            logger.exception("Error getting user statistics")
             return None
     
     async def update_last_active(self, user_id: uuid.UUID) -> bool:
@@ -98,8 +101,8 @@ class UserService:
             response = self.supabase.table("users").update(update_data).eq("id", str(user_id)).execute()
             
             return len(response.data) > 0
-        except Exception as e:
-            print(f"Error updating last active: {e}")
+        except Exception:
+            logger.exception("Error updating last active")
             return False
     
     async def get_user_deck_count(self, user_id: uuid.UUID) -> int:
@@ -108,52 +111,35 @@ class UserService:
             response = self.supabase.table("decks").select("id", count="exact").eq("user_id", str(user_id)).execute()
             
             return response.count or 0
-        except Exception as e:
-            print(f"Error getting deck count: {e}")
+        except Exception:
+            logger.exception("Error getting deck count")
             return 0
     
     async def get_user_total_cards(self, user_id: uuid.UUID) -> int:
         """Get total number of cards across all user's decks"""
         try:
-            # Get all decks for the user
-            decks_response = self.supabase.table("decks").select("id").eq("user_id", str(user_id)).execute()
-            
-            if not decks_response.data:
-                return 0
-            
-            deck_ids = [deck["id"] for deck in decks_response.data]
+            # Count cards in all user's decks with a single join
+            response = self.supabase.rpc("user_total_cards", {"uid": str(user_id)}).execute()
             
-            # Count cards in all user's decks
-            total_cards = 0
-            for deck_id in deck_ids:
-                cards_response = self.supabase.table("cards").select("id", count="exact").eq("deck_id", deck_id).execute()
-                total_cards += cards_response.count or 0
-            
-            return total_cards
-        except Exception as e:
-            print(f"Error getting total cards: {e}")
+            return response.data or 0
+        except Exception:
+            logger.exception("Error getting total cards")
             return 0
     
     async def get_users_with_stats(self) -> List[dict]:
         """Get all users with their basic statistics"""
         try:
-            users = await self.get_all_users()
-            users_with_stats = []
+            response = self.supabase.table("users_with_stats").select("*").execute()
             
-            for user in users:
-                stats = await self.get_user_statistics(user.id)
-                deck_count = await self.get_user_deck_count(user.id)
-                total_cards = await self.get_user_total_cards(user.id)
-                
-                user_data = {
-                    "user": user,
-                    "statistics": stats,
-                    "deck_count": deck_count,
-                    "total_cards": total_cards
+            return [
+                {
+                    "user": UserResponse(**row),
+                    "statistics": UserStatisticsResponse(**row) if row["has_statistics"] else None,
+                    "deck_count": row["deck_count"],
+                    "total_cards": row["total_cards"]
                 }
-                users_with_stats.append(user_data)
-            
-            return users_with_stats
-        except Exception as e:
-            print(f"Error getting users with stats: {e}")
+                for row in response.data
+            ]
+        except Exception:
+            logger.exception("Error getting users with stats")
             return []
\ No newline at end of file
@@ -0,0 +1,20 @@
+-- Covering indexes for the hot progress, card and deck lookups.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so run
+-- these statements one at a time (e.g. from the Supabase SQL editor or psql).
+
+-- One progress row per (user, card); INCLUDE lets the scheduler read the
+-- learning metrics straight from the index.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ucp_user_card
+    ON user_card_progress (user_id, card_id)
+    INCLUDE (mastery_level, difficulty_score, quiz_attempts, quiz_correct, next_review_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS cards_deck
+    ON cards (deck_id)
+    INCLUDE (id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS decks_user
+    ON decks (user_id);
+
+-- Verify the planner picks the new indexes, e.g.:
+-- EXPLAIN ANALYZE SELECT id FROM cards WHERE deck_id = '<deck uuid>';
+-- EXPLAIN ANALYZE SELECT * FROM user_card_progress WHERE user_id = '<user uuid>' AND card_id = '<card uuid>';
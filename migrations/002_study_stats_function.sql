@@ -0,0 +1,31 @@
+-- Aggregate a user's card progress (optionally for one deck) into a single row
+-- so get_study_statistics no longer downloads every progress record.
+CREATE OR REPLACE FUNCTION study_stats(uid uuid, did uuid DEFAULT NULL)
+RETURNS TABLE (
+    total_cards bigint,
+    mastery_0 bigint,
+    mastery_1 bigint,
+    mastery_2 bigint,
+    mastery_3 bigint,
+    total_attempts bigint,
+    total_correct bigint,
+    avg_difficulty double precision,
+    overdue_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        count(*),
+        count(*) FILTER (WHERE p.mastery_level = 0),
+        count(*) FILTER (WHERE p.mastery_level = 1),
+        count(*) FILTER (WHERE p.mastery_level = 2),
+        count(*) FILTER (WHERE p.mastery_level >= 3),
+        coalesce(sum(p.quiz_attempts), 0),
+        coalesce(sum(p.quiz_correct), 0),
+        coalesce(avg(p.difficulty_score), 0),
+        count(*) FILTER (WHERE p.next_review_at <= now())
+    FROM user_card_progress p
+    WHERE p.user_id = uid
+      AND (did IS NULL OR p.card_id IN (SELECT c.id FROM cards c WHERE c.deck_id = did));
+$$;
@@ -0,0 +1,28 @@
+-- Bucket a user's card progress (optionally for one deck) by mastery level
+-- so the statistics endpoints receive four rows instead of every progress record.
+CREATE OR REPLACE FUNCTION user_mastery_counts(uid uuid, deck uuid DEFAULT NULL)
+RETURNS TABLE (
+    bucket text,
+    cnt bigint,
+    attempts bigint,
+    correct bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        CASE coalesce(p.mastery_level, 0)
+            WHEN 0 THEN 'new'
+            WHEN 1 THEN 'learning'
+            WHEN 2 THEN 'review'
+            ELSE 'mastered'
+        END AS bucket,
+        count(*),
+        coalesce(sum(p.quiz_attempts), 0),
+        coalesce(sum(p.quiz_correct), 0)
+    FROM user_card_progress p
+    LEFT JOIN cards c ON c.id = p.card_id
+    WHERE p.user_id = uid
+      AND (deck IS NULL OR c.deck_id = deck)
+    GROUP BY 1;
+$$;
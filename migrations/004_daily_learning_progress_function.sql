@@ -0,0 +1,28 @@
+-- Sum a user's study sessions per UTC day since the given timestamp
+-- so get_learning_progress_over_time receives one row per active day.
+CREATE OR REPLACE FUNCTION daily_learning_progress(uid uuid, since timestamptz)
+RETURNS TABLE (
+    day date,
+    sessions bigint,
+    cards_studied bigint,
+    correct bigint,
+    attempts bigint,
+    study_time bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        date_trunc('day', s.created_at AT TIME ZONE 'UTC')::date AS day,
+        count(*),
+        coalesce(sum(s.cards_studied), 0),
+        coalesce(sum(s.correct_answers), 0),
+        -- Attempts are approximated by cards studied, as before
+        coalesce(sum(s.cards_studied), 0),
+        coalesce(sum(s.session_duration), 0)
+    FROM study_sessions s
+    WHERE s.user_id = uid
+      AND s.created_at >= since
+    GROUP BY 1
+    ORDER BY 1;
+$$;
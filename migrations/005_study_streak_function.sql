@@ -0,0 +1,30 @@
+-- Count the consecutive UTC days with at least one study session, ending today
+-- or yesterday, using the gaps-and-islands trick so only one integer is returned.
+CREATE OR REPLACE FUNCTION study_streak(uid uuid)
+RETURNS integer
+LANGUAGE sql
+STABLE
+AS $$
+    WITH d AS (
+        SELECT DISTINCT (s.created_at AT TIME ZONE 'UTC')::date AS day
+        FROM study_sessions s
+        WHERE s.user_id = uid
+    ),
+    g AS (
+        -- Consecutive days share the same day - row_number() value
+        SELECT day, day - (row_number() OVER (ORDER BY day))::int AS grp
+        FROM d
+    ),
+    today AS (
+        SELECT (now() AT TIME ZONE 'UTC')::date AS day
+    )
+    SELECT count(*)::integer
+    FROM g
+    WHERE g.grp = (
+        SELECT g2.grp
+        FROM g g2, today t
+        WHERE g2.day IN (t.day, t.day - 1)
+        ORDER BY g2.day DESC
+        LIMIT 1
+    );
+$$;
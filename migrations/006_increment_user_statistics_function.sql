@@ -0,0 +1,21 @@
+-- Atomically add to a user's running statistics, creating the row on first use,
+-- so concurrent session completions can't overwrite each other's increments.
+CREATE OR REPLACE FUNCTION increment_user_statistics(
+    uid uuid,
+    dt integer DEFAULT 0,
+    dv integer DEFAULT 0,
+    da integer DEFAULT 0,
+    dc integer DEFAULT 0
+)
+RETURNS void
+LANGUAGE sql
+VOLATILE
+AS $$
+    INSERT INTO user_statistics AS us (user_id, study_time_minutes, total_views, total_quiz_attempts, total_correct_answers)
+    VALUES (uid, dt, dv, da, dc)
+    ON CONFLICT (user_id) DO UPDATE SET
+        study_time_minutes = us.study_time_minutes + EXCLUDED.study_time_minutes,
+        total_views = us.total_views + EXCLUDED.total_views,
+        total_quiz_attempts = us.total_quiz_attempts + EXCLUDED.total_quiz_attempts,
+        total_correct_answers = us.total_correct_answers + EXCLUDED.total_correct_answers;
+$$;
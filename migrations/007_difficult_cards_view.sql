@@ -0,0 +1,22 @@
+-- Progress rows joined to their card with the quiz accuracy precomputed, so
+-- get_difficult_cards can rank and limit in Postgres.
+-- security_invoker keeps row level security applying to the calling user.
+CREATE OR REPLACE VIEW v_difficult_cards
+WITH (security_invoker = true)
+AS
+SELECT
+    p.user_id,
+    p.card_id,
+    c.hanzi,
+    c.pinyin,
+    c.english,
+    p.mastery_level,
+    p.difficulty_score,
+    p.quiz_attempts,
+    p.quiz_correct,
+    coalesce(p.quiz_correct::double precision / NULLIF(p.quiz_attempts, 0), 0) AS accuracy_rate,
+    p.first_flipped_at,
+    p.last_quiz_attempt_at,
+    p.total_study_time
+FROM user_card_progress p
+JOIN cards c ON c.id = p.card_id;
@@ -0,0 +1,131 @@
+-- Per-deck card totals and the user's mastery buckets for each of their decks,
+-- one row per deck. Aggregated in Postgres so no per-card rows reach the client
+-- (and PostgREST's max-rows cap can't truncate the counts).
+CREATE OR REPLACE FUNCTION deck_statistics(uid uuid)
+RETURNS TABLE (
+    id uuid,
+    name text,
+    total_study_time integer,
+    last_studied_at timestamptz,
+    created_at timestamptz,
+    total_cards bigint,
+    new_cards bigint,
+    learning_cards bigint,
+    review_cards bigint,
+    mastered_cards bigint,
+    attempts bigint,
+    correct bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH deck_cards AS (
+        SELECT c.deck_id, count(*) AS total_cards
+        FROM cards c
+        JOIN decks d ON d.id = c.deck_id
+        WHERE d.user_id = uid
+        GROUP BY c.deck_id
+    ),
+    deck_progress AS (
+        SELECT
+            c.deck_id,
+            count(*) FILTER (WHERE coalesce(p.mastery_level, 0) = 0) AS new_cards,
+            count(*) FILTER (WHERE p.mastery_level = 1) AS learning_cards,
+            count(*) FILTER (WHERE p.mastery_level = 2) AS review_cards,
+            count(*) FILTER (WHERE coalesce(p.mastery_level, 0) NOT IN (0, 1, 2)) AS mastered_cards,
+            coalesce(sum(p.quiz_attempts), 0) AS attempts,
+            coalesce(sum(p.quiz_correct), 0) AS correct
+        FROM user_card_progress p
+        JOIN cards c ON c.id = p.card_id
+        WHERE p.user_id = uid
+        GROUP BY c.deck_id
+    )
+    SELECT
+        d.id,
+        d.name::text,
+        d.total_study_time,
+        d.last_studied_at,
+        d.created_at,
+        coalesce(dc.total_cards, 0),
+        coalesce(dp.new_cards, 0),
+        coalesce(dp.learning_cards, 0),
+        coalesce(dp.review_cards, 0),
+        coalesce(dp.mastered_cards, 0),
+        coalesce(dp.attempts, 0),
+        coalesce(dp.correct, 0)
+    FROM decks d
+    LEFT JOIN deck_cards dc ON dc.deck_id = d.id
+    LEFT JOIN deck_progress dp ON dp.deck_id = d.id
+    WHERE d.user_id = uid
+    ORDER BY d.created_at;
+$$;
+
+-- Number and total duration of a user's study sessions since a point in time.
+CREATE OR REPLACE FUNCTION recent_session_totals(uid uuid, since timestamptz)
+RETURNS TABLE (
+    sessions bigint,
+    duration bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT count(*), coalesce(sum(s.session_duration), 0)
+    FROM study_sessions s
+    WHERE s.user_id = uid
+      AND s.created_at >= since;
+$$;
+
+-- Everything the dashboard and statistics pages render in one round-trip:
+-- overview totals, per-deck aggregates and the daily series for the last `days` days.
+-- Builds on user_mastery_counts, study_streak, daily_learning_progress and the two functions above.
+CREATE OR REPLACE FUNCTION dashboard(uid uuid, days integer DEFAULT 30)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    WITH recent_sessions AS (
+        SELECT * FROM recent_session_totals(uid, now() - interval '30 days')
+    )
+    SELECT jsonb_build_object(
+        'overview', jsonb_build_object(
+            'user_statistics', (
+                SELECT jsonb_build_object(
+                    'study_time_minutes', us.study_time_minutes,
+                    'total_quiz_attempts', us.total_quiz_attempts,
+                    'total_correct_answers', us.total_correct_answers
+                )
+                FROM user_statistics us
+                WHERE us.user_id = uid
+            ),
+            'mastery', (
+                SELECT coalesce(jsonb_agg(to_jsonb(m)), '[]'::jsonb)
+                FROM user_mastery_counts(uid) m
+            ),
+            'recent_sessions_count', (SELECT sessions FROM recent_sessions),
+            'recent_sessions_duration', (SELECT duration FROM recent_sessions),
+            'study_streak', study_streak(uid)
+        ),
+        'decks', (
+            SELECT coalesce(jsonb_agg(jsonb_build_object(
+                'id', ds.id,
+                'name', ds.name,
+                'total_study_time', ds.total_study_time,
+                'last_studied_at', ds.last_studied_at,
+                'total_cards', ds.total_cards,
+                'mastery', jsonb_build_object(
+                    'new', ds.new_cards,
+                    'learning', ds.learning_cards,
+                    'review', ds.review_cards,
+                    'mastered', ds.mastered_cards
+                ),
+                'attempts', ds.attempts,
+                'correct', ds.correct
+            ) ORDER BY ds.created_at), '[]'::jsonb)
+            FROM deck_statistics(uid) ds
+        ),
+        'timeseries', (
+            SELECT coalesce(jsonb_agg(to_jsonb(t) ORDER BY t.day), '[]'::jsonb)
+            FROM daily_learning_progress(uid, now() - make_interval(days => days)) t
+        )
+    );
+$$;
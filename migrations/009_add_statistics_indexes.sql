@@ -0,0 +1,24 @@
+-- Indexes for the statistics queries and functions.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so run
+-- these statements one at a time (e.g. from the Supabase SQL editor or psql).
+-- cards (deck_id) and user_card_progress (user_id, card_id) are already
+-- covered by cards_deck and ucp_user_card from 001.
+
+-- user_mastery_counts and the dashboard mastery buckets
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ucp_user_mastery
+    ON user_card_progress (user_id, mastery_level);
+
+-- v_difficult_cards only ranks cards quizzed at least twice
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ucp_user_quizzed
+    ON user_card_progress (user_id, quiz_attempts)
+    WHERE quiz_attempts >= 2;
+
+-- Recent sessions, daily_learning_progress and study_streak
+CREATE INDEX CONCURRENTLY IF NOT EXISTS study_sessions_user_created
+    ON study_sessions (user_id, created_at DESC);
+
+-- Verify the planner picks the new indexes, e.g.:
+-- EXPLAIN ANALYZE SELECT * FROM user_mastery_counts('<user uuid>');
+-- EXPLAIN ANALYZE SELECT * FROM daily_learning_progress('<user uuid>', now() - interval '30 days');
+-- EXPLAIN ANALYZE SELECT * FROM v_difficult_cards WHERE user_id = '<user uuid>' AND quiz_attempts >= 2
+--     ORDER BY accuracy_rate, difficulty_score DESC LIMIT 20;
@@ -0,0 +1,11 @@
+-- Let Postgres stamp session and interaction rows instead of sending a
+-- client-side timestamp with every insert.
+UPDATE study_sessions SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE study_sessions
+    ALTER COLUMN created_at SET DEFAULT now(),
+    ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE card_interactions SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE card_interactions
+    ALTER COLUMN created_at SET DEFAULT now(),
+    ALTER COLUMN created_at SET NOT NULL;
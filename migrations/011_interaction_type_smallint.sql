@@ -0,0 +1,16 @@
+-- Store card_interactions.interaction_type as a smallint instead of text,
+-- matching app.schemas.schemas.InteractionType: 0=flip, 1=quiz_correct, 2=quiz_incorrect.
+-- The API keeps using the names; the app converts at the database boundary.
+ALTER TABLE card_interactions DROP CONSTRAINT IF EXISTS card_interactions_interaction_type_check;
+
+ALTER TABLE card_interactions
+    ALTER COLUMN interaction_type TYPE smallint USING (
+        CASE interaction_type
+            WHEN 'flip' THEN 0
+            WHEN 'quiz_correct' THEN 1
+            WHEN 'quiz_incorrect' THEN 2
+        END
+    );
+
+ALTER TABLE card_interactions
+    ADD CONSTRAINT card_interactions_interaction_type_check CHECK (interaction_type BETWEEN 0 AND 2);
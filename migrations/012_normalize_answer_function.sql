@@ -0,0 +1,10 @@
+-- Fold a quiz answer for comparison: NFC-normalize so composed and decomposed
+-- pinyin tone marks (ǜ vs ü followed by a combining grave) compare equal, then trim and lowercase.
+-- Tone marks are kept, since they distinguish different words.
+CREATE OR REPLACE FUNCTION normalize_answer(answer text)
+RETURNS text
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT lower(btrim(normalize(answer, NFC)));
+$$;
@@ -0,0 +1,16 @@
+-- Bump a session's answer counters in place. Incrementing in SQL means
+-- concurrent answers to the same session can't lose each other's updates.
+CREATE OR REPLACE FUNCTION increment_session_counters(
+    sid uuid,
+    uid uuid,
+    correct boolean
+)
+RETURNS void
+LANGUAGE sql
+VOLATILE
+AS $$
+    UPDATE study_sessions
+    SET cards_studied = cards_studied + 1,
+        correct_answers = correct_answers + CASE WHEN correct THEN 1 ELSE 0 END
+    WHERE id = sid AND user_id = uid;
+$$;
@@ -0,0 +1,72 @@
+-- Check a quiz answer, record the interaction and bump the session counters
+-- in one round-trip and one transaction. Returns NULL when the session does not
+-- belong to the user or the card does not exist.
+-- Answers are compared with normalize_answer (012) and the counters go through
+-- increment_session_counters (013).
+CREATE OR REPLACE FUNCTION submit_quiz_answer(
+    p_session_id uuid,
+    p_user_id uuid,
+    p_card_id uuid,
+    p_selected text,
+    p_response_time integer DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+VOLATILE
+AS $$
+DECLARE
+    v_direction text;
+    v_card cards%ROWTYPE;
+    v_correct_answer text;
+    v_is_correct boolean;
+    v_explanation text;
+BEGIN
+    SELECT s.direction INTO v_direction
+    FROM study_sessions s
+    WHERE s.id = p_session_id AND s.user_id = p_user_id;
+
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT * INTO v_card FROM cards c WHERE c.id = p_card_id;
+
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    IF v_direction = 'chinese_to_english' THEN
+        v_correct_answer := v_card.english;
+    ELSE
+        v_correct_answer := v_card.hanzi || ' (' || v_card.pinyin || ')';
+    END IF;
+
+    v_is_correct := normalize_answer(p_selected) = normalize_answer(v_correct_answer);
+
+    INSERT INTO card_interactions (session_id, user_id, card_id, interaction_type, direction, response_time)
+    VALUES (
+        p_session_id,
+        p_user_id,
+        p_card_id,
+        CASE WHEN v_is_correct THEN 1 ELSE 2 END,
+        v_direction,
+        p_response_time
+    );
+
+    PERFORM increment_session_counters(p_session_id, p_user_id, v_is_correct);
+
+    IF NOT v_is_correct THEN
+        IF v_direction = 'chinese_to_english' THEN
+            v_explanation := format('''%s'' (%s) means ''%s''', v_card.hanzi, v_card.pinyin, v_card.english);
+        ELSE
+            v_explanation := format('''%s'' is ''%s'' (%s) in Chinese', v_card.english, v_card.hanzi, v_card.pinyin);
+        END IF;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'correct', v_is_correct,
+        'correct_answer', v_correct_answer,
+        'explanation', v_explanation
+    );
+END;
+$$;
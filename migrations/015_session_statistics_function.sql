@@ -0,0 +1,26 @@
+-- Aggregate a study session's interactions into a single row
+-- so get_session_statistics no longer downloads every interaction.
+-- Interaction types are the smallint codes from 011: 0=flip, 1=quiz_correct, 2=quiz_incorrect.
+CREATE OR REPLACE FUNCTION session_statistics(sid uuid)
+RETURNS TABLE (
+    total_interactions bigint,
+    flip_count bigint,
+    quiz_correct bigint,
+    quiz_total bigint,
+    avg_response_time double precision,
+    unique_cards bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        count(*),
+        count(*) FILTER (WHERE i.interaction_type = 0),
+        count(*) FILTER (WHERE i.interaction_type = 1),
+        count(*) FILTER (WHERE i.interaction_type >= 1),
+        -- Unanswered timings (NULL or 0) are left out of the average
+        coalesce(avg(i.response_time) FILTER (WHERE i.interaction_type >= 1 AND i.response_time <> 0), 0),
+        count(DISTINCT i.card_id)
+    FROM card_interactions i
+    WHERE i.session_id = sid;
+$$;
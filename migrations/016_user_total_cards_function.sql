@@ -0,0 +1,11 @@
+-- Count the cards across all of a user's decks in one query.
+CREATE OR REPLACE FUNCTION user_total_cards(uid uuid)
+RETURNS bigint
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT count(*)
+    FROM cards c
+    JOIN decks d ON d.id = c.deck_id
+    WHERE d.user_id = uid;
+$$;
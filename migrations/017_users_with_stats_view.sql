@@ -0,0 +1,32 @@
+-- Every user with their statistics row and deck/card counts, so the admin
+-- users list is one query instead of several per user.
+-- security_invoker keeps row level security applying to the calling user.
+CREATE OR REPLACE VIEW users_with_stats
+WITH (security_invoker = true)
+AS
+SELECT
+    u.id,
+    u.username,
+    u.email,
+    u.created_at,
+    u.last_active_at,
+    s.user_id IS NOT NULL AS has_statistics,
+    s.total_views,
+    s.total_correct_answers,
+    s.total_quiz_attempts,
+    s.study_time_minutes,
+    coalesce(dc.deck_count, 0) AS deck_count,
+    coalesce(cc.total_cards, 0) AS total_cards
+FROM users u
+LEFT JOIN user_statistics s ON s.user_id = u.id
+LEFT JOIN (
+    SELECT d.user_id, count(*) AS deck_count
+    FROM decks d
+    GROUP BY d.user_id
+) dc ON dc.user_id = u.id
+LEFT JOIN (
+    SELECT d.user_id, count(*) AS total_cards
+    FROM cards c
+    JOIN decks d ON d.id = c.deck_id
+    GROUP BY d.user_id
+) cc ON cc.user_id = u.id;
@@ -0,0 +1,81 @@
+"""
+Shared fixtures for service tests
+"""
+from collections import defaultdict
+import pytest
+
+from app.core.cache import deck_card_ids_cache, deck_cards_cache, statistics_cache
+
+
+class FakeResponse:
+    """Stand-in for a postgrest APIResponse"""
+
+    def __init__(self, data=None, count=None):
+        self.data = [] if data is None else data
+        self.count = count
+
+
+class FakeQuery:
+    """Records every builder call and returns the next scripted response on execute()"""
+
+    def __init__(self, client, key):
+        self.client = client
+        self.key = key
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return method
+
+    def call(self, name):
+        """Arguments of the first recorded call to a builder method"""
+        return next((args, kwargs) for method, args, kwargs in self.calls if method == name)
+
+    def execute(self):
+        self.client.executed.append(self)
+        results = self.client.results[self.key]
+        result = results.pop(0) if results else FakeResponse()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeSupabase:
+    """
+    Scripted Supabase client: queue responses per table (or per RPC as "rpc:<name>")
+    and inspect the queries that were executed
+    """
+
+    def __init__(self):
+        self.results = defaultdict(list)
+        self.executed = []
+
+    def queue(self, key, data=None, count=None, error=None):
+        self.results[key].append(error if error is not None else FakeResponse(data, count))
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, fn, params=None):
+        query = FakeQuery(self, f"rpc:{fn}")
+        query.calls.append(("rpc", (fn, params), {}))
+        return query
+
+    def queries(self, key):
+        """Executed queries for a table or RPC, in order"""
+        return [query for query in self.executed if query.key == key]
+
+
+@pytest.fixture
+def supabase():
+    return FakeSupabase()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Module-level caches would otherwise leak between tests"""
+    for cache in (deck_card_ids_cache, deck_cards_cache, statistics_cache):
+        cache.clear()
+    yield
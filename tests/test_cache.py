@@ -0,0 +1,66 @@
+"""
+Tests for the in-process TTL cache
+"""
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.monotonic"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestTTLCache:
+    """Expiry, size bound and prefix invalidation"""
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = TTLCache(ttl=30)
+        cache.set("deck", [1, 2])
+
+        clock[0] += 29
+        assert cache.get("deck") == [1, 2]
+        clock[0] += 1
+        assert cache.get("deck", "missing") == "missing"
+
+    def test_full_cache_drops_expired_entries_before_live_ones(self, clock):
+        cache = TTLCache(ttl=30, maxsize=2)
+        cache.set("old", 1)
+        clock[0] += 20
+        cache.set("live", 2)
+        clock[0] += 15  # "old" has expired, "live" has not
+
+        cache.set("new", 3)
+
+        assert cache.get("live") == 2
+        assert cache.get("new") == 3
+        assert cache.get("old") is None
+
+    def test_full_cache_evicts_oldest_entry(self, clock):
+        cache = TTLCache(ttl=30, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)  # overwriting an existing key never evicts
+
+        cache.set("c", 3)
+
+        assert cache.get("a") is None
+        assert (cache.get("b"), cache.get("c")) == (2, 3)
+
+    def test_pop_prefix_removes_matching_tuple_keys_only(self, clock):
+        cache = TTLCache(ttl=30)
+        cache.set(("user-1", "overview"), 1)
+        cache.set(("user-1", "dashboard", 30), 2)
+        cache.set(("user-2", "overview"), 3)
+        cache.set("user-1", 4)
+
+        cache.pop_prefix(("user-1",))
+
+        assert cache.get(("user-1", "overview")) is None
+        assert cache.get(("user-1", "dashboard", 30)) is None
+        assert cache.get(("user-2", "overview")) == 3
+        assert cache.get("user-1") == 4
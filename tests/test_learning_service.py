@@ -0,0 +1,130 @@
+"""
+Tests for the adaptive learning algorithm
+"""
+import uuid
+
+import numpy as np
+import pytest
+
+from app.services.learning_service import LearningAlgorithm, ProgressRow
+
+
+def _progress(mastery_level=0, difficulty_score=1.0, next_review_at=None):
+    return ProgressRow(
+        card_id=str(uuid.uuid4()),
+        mastery_level=mastery_level,
+        difficulty_score=difficulty_score,
+        quiz_attempts=0,
+        quiz_correct=0,
+        next_review_at=next_review_at,
+        consecutive_correct=0
+    )
+
+
+class TestSelectCardsForStudy:
+    """Card selection, including its error fallback"""
+
+    async def test_returns_empty_list_when_card_lookup_fails(self, supabase):
+        supabase.queue("cards", error=RuntimeError("connection reset"))
+        algorithm = LearningAlgorithm(supabase)
+
+        selected = await algorithm.select_cards_for_study(uuid.uuid4(), uuid.uuid4())
+
+        assert selected == []
+
+    async def test_falls_back_to_deck_order_when_progress_lookup_fails(self, supabase):
+        card_ids = [str(uuid.uuid4()) for _ in range(5)]
+        supabase.queue("cards", data=[{"id": card_id} for card_id in card_ids])
+        supabase.queue("user_card_progress", error=RuntimeError("connection reset"))
+        algorithm = LearningAlgorithm(supabase)
+
+        selected = await algorithm.select_cards_for_study(uuid.uuid4(), uuid.uuid4(), target_count=3)
+
+        assert selected == [uuid.UUID(card_id) for card_id in card_ids[:3]]
+
+    async def test_filters_progress_by_deck_instead_of_listing_card_ids(self, supabase):
+        deck_id = uuid.uuid4()
+        supabase.queue("cards", data=[{"id": str(uuid.uuid4())} for _ in range(300)])
+        algorithm = LearningAlgorithm(supabase)
+
+        await algorithm.select_cards_for_study(uuid.uuid4(), deck_id)
+
+        progress_query = supabase.queries("user_card_progress")[0]
+        assert "cards!inner(deck_id)" in progress_query.call("select")[0][0]
+        assert ("eq", ("cards.deck_id", str(deck_id)), {}) in progress_query.calls
+        assert not any(method == "in_" for method, _, _ in progress_query.calls)
+
+    async def test_keeps_deck_order_between_equal_priorities(self, supabase):
+        new_a, mastered_a, new_b, mastered_b = (str(uuid.uuid4()) for _ in range(4))
+        supabase.queue("cards", data=[{"id": card_id} for card_id in (new_a, mastered_a, new_b, mastered_b)])
+        supabase.queue("user_card_progress", data=[
+            {"card_id": card_id, "mastery_level": 3, "difficulty_score": 1.0, "next_review_at": "2999-01-01T00:00:00Z"}
+            for card_id in (mastered_a, mastered_b)
+        ])
+        algorithm = LearningAlgorithm(supabase)
+
+        # Few cards for the target count, so selection is deterministic
+        selected = await algorithm.select_cards_for_study(uuid.uuid4(), uuid.uuid4(), target_count=20)
+
+        assert selected == [uuid.UUID(card_id) for card_id in (new_a, new_b, mastered_a, mastered_b)]
+
+
+class TestCalculateCardPriorities:
+    """Vectorized priority scoring"""
+
+    NOW = 1_700_000_000.0
+
+    def test_weights_by_mastery_and_difficulty(self, supabase):
+        algorithm = LearningAlgorithm(supabase)
+        config = algorithm.config
+        rows = [None, _progress(1, 2.0), _progress(2), _progress(3), _progress(5, 0.5)]
+
+        priorities = algorithm._calculate_card_priorities(rows, self.NOW, include_overdue=False)
+
+        np.testing.assert_allclose(priorities, [
+            config.new_card_weight * 2.0,
+            config.learning_weight * 2.0,
+            config.review_weight,
+            config.mastered_weight,
+            config.mastered_weight * 0.5  # levels above 3 count as mastered
+        ])
+
+    @pytest.mark.parametrize("hours_overdue, boost", [(12, 1.5), (24, 2.0), (240, 3.0)])
+    def test_boosts_overdue_cards_up_to_three_times(self, supabase, hours_overdue, boost):
+        algorithm = LearningAlgorithm(supabase)
+        config = algorithm.config
+        rows = [_progress(2, next_review_at=self.NOW - hours_overdue * 3600), _progress(2, next_review_at=self.NOW + 60), _progress(2)]
+
+        priorities = algorithm._calculate_card_priorities(rows, self.NOW, include_overdue=True)
+
+        np.testing.assert_allclose(priorities, [config.review_weight * boost * config.overdue_weight, config.review_weight, config.review_weight])
+
+
+class TestUpdateCardProgresses:
+    """Batched progress updates"""
+
+    async def test_folds_repeated_interactions_into_one_row_per_card(self, supabase):
+        user_id, repeated, single = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        supabase.queue("user_card_progress", data=[])
+        algorithm = LearningAlgorithm(supabase)
+
+        updated = await algorithm.update_card_progresses(user_id, [
+            (repeated, "flip"),
+            (single, "flip"),
+            (repeated, "quiz_correct"),
+            (repeated, "quiz_incorrect")
+        ])
+
+        assert updated
+        select, upsert = supabase.queries("user_card_progress")
+        assert select.call("in_")[0] == ("card_id", [str(repeated), str(single)])
+        rows = upsert.call("upsert")[0][0]
+        assert [row["card_id"] for row in rows] == [str(repeated), str(single)]
+        assert (rows[0]["flip_count"], rows[0]["quiz_attempts"], rows[0]["quiz_correct"]) == (1, 2, 1)
+        assert (rows[1]["flip_count"], rows[1]["quiz_attempts"]) == (1, 0)
+
+    async def test_ignores_unknown_interaction_types(self, supabase):
+        algorithm = LearningAlgorithm(supabase)
+
+        assert await algorithm.update_card_progresses(uuid.uuid4(), [(uuid.uuid4(), "skip")])
+        assert not supabase.executed
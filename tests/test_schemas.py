@@ -0,0 +1,42 @@
+"""
+Tests for request/response schemas
+"""
+import uuid
+
+import pytest
+
+from app.schemas.schemas import CardInteractionResponse, InteractionType
+
+
+class TestInteractionType:
+    """Smallint codes and the API labels they map to"""
+
+    @pytest.mark.parametrize("code, label", [(0, "flip"), (1, "quiz_correct"), (2, "quiz_incorrect")])
+    def test_label_round_trips(self, code, label):
+        assert InteractionType(code).label == label
+        assert InteractionType.from_label(label) == code
+
+    def test_unknown_label_raises(self):
+        with pytest.raises(KeyError):
+            InteractionType.from_label("skip")
+
+
+class TestCardInteractionResponse:
+    """Rows read back from card_interactions carry the numeric code"""
+
+    def _row(self, interaction_type):
+        return {
+            "id": str(uuid.uuid4()),
+            "session_id": str(uuid.uuid4()),
+            "card_id": str(uuid.uuid4()),
+            "interaction_type": interaction_type,
+            "direction": None,
+            "response_time": None,
+            "created_at": "2024-03-01T10:00:00+00:00"
+        }
+
+    def test_maps_stored_codes_to_labels(self):
+        assert CardInteractionResponse(**self._row(2)).interaction_type == "quiz_incorrect"
+
+    def test_keeps_labels_as_they_are(self):
+        assert CardInteractionResponse(**self._row("flip")).interaction_type == "flip"
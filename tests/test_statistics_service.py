@@ -0,0 +1,99 @@
+"""
+Tests for the statistics service
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from app.services.statistics_service import StatisticsService
+
+
+def _deck_row(**overrides):
+    row = {
+        "id": str(uuid.uuid4()),
+        "name": "HSK 1",
+        "total_study_time": 600,
+        "last_studied_at": "2024-03-01T10:00:00+00:00",
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "total_cards": 2500,
+        "new_cards": 200,
+        "learning_cards": 300,
+        "review_cards": 400,
+        "mastered_cards": 600,
+        "attempts": 5000,
+        "correct": 4000
+    }
+    row.update(overrides)
+    return row
+
+
+class TestAllDeckStatistics:
+    """Per-deck statistics come from the deck_statistics RPC"""
+
+    async def test_builds_deck_stats_from_server_side_counts(self, supabase):
+        row = _deck_row()
+        supabase.queue("rpc:deck_statistics", data=[row])
+
+        [stats] = await StatisticsService(supabase).get_all_deck_statistics(uuid.uuid4())
+
+        assert stats.deck_id == row["id"]
+        assert stats.total_cards == 2500
+        assert stats.cards_studied == 1500
+        assert stats.study_progress_percentage == 60.0
+        # Cards without progress count as new
+        assert stats.mastery_distribution == {"new": 1200, "learning": 300, "review": 400, "mastered": 600}
+        assert stats.average_accuracy == 0.8
+        assert stats.total_study_time_minutes == 10
+        assert not supabase.queries("cards")
+        assert not supabase.queries("user_card_progress")
+
+    async def test_returns_empty_list_on_error(self, supabase):
+        supabase.queue("rpc:deck_statistics", error=RuntimeError("timeout"))
+
+        assert await StatisticsService(supabase).get_all_deck_statistics(uuid.uuid4()) == []
+
+
+class TestOverviewStatistics:
+    """Recent session totals are summed in Postgres"""
+
+    async def test_average_session_duration_uses_server_side_totals(self, supabase):
+        supabase.queue("user_statistics", data=[{"study_time_minutes": 90, "total_quiz_attempts": 10, "total_correct_answers": 7}])
+        supabase.queue("rpc:user_mastery_counts", data=[{"bucket": "learning", "cnt": 3, "attempts": 10, "correct": 7}])
+        supabase.queue("rpc:recent_session_totals", data=[{"sessions": 1500, "duration": 30000}])
+        supabase.queue("rpc:study_streak", data=4)
+
+        stats = await StatisticsService(supabase).get_user_overview_stats(uuid.uuid4())
+
+        assert stats.recent_sessions_count == 1500
+        assert stats.average_session_duration == 20.0
+        assert stats.overall_accuracy == 0.7
+        assert stats.study_streak_days == 4
+        assert stats.cards_by_mastery["learning"] == 3
+        assert not supabase.queries("study_sessions")
+
+
+class TestProgressSeries:
+    """Daily rows are zero-filled onto the full date range"""
+
+    def test_zero_fills_missing_days_and_computes_accuracy(self, supabase):
+        today = datetime.utcnow()
+        days = [(today - timedelta(days=offset)).strftime("%Y-%m-%d") for offset in (2, 1, 0)]
+        rows = [
+            {"day": days[1], "sessions": 2, "cards_studied": 30, "correct": 6, "attempts": 8, "study_time": 25},
+            {"day": days[2], "sessions": 1, "cards_studied": 5, "correct": 0, "attempts": 0, "study_time": 4}
+        ]
+
+        series = StatisticsService(supabase)._build_progress_series(rows, today - timedelta(days=2))
+
+        assert series == {
+            "dates": days,
+            "sessions": [0, 2, 1],
+            "accuracy_rates": [0.0, 75.0, 0.0],
+            "study_times": [0, 25, 4],
+            "cards_studied": [0, 30, 5]
+        }
+
+    def test_handles_no_rows(self, supabase):
+        series = StatisticsService(supabase)._build_progress_series([], datetime.utcnow())
+
+        assert series["sessions"] == [0]
+        assert series["accuracy_rates"] == [0.0]
@@ -0,0 +1,101 @@
+"""
+Tests for the study session service
+"""
+import logging
+import random
+import uuid
+from datetime import datetime
+
+from app.core.cache import deck_cards_cache
+from app.schemas.schemas import CardInteractionCreate, CardResponse
+from app.services.study_service import StudySessionService
+
+
+def _stored_rows(rows):
+    """Echo insert payloads back the way PostgREST returns them"""
+    return [
+        {**row, "id": str(uuid.uuid4()), "created_at": "2024-03-01T10:00:00+00:00"}
+        for row in rows
+    ]
+
+
+class TestRecordCardInteractions:
+    """Batch interaction recording"""
+
+    def _interactions(self, session_id, card_id):
+        return [
+            CardInteractionCreate(session_id=session_id, card_id=card_id, interaction_type="flip"),
+            CardInteractionCreate(session_id=session_id, card_id=card_id, interaction_type="quiz_correct", response_time=900)
+        ]
+
+    async def test_stores_the_batch_with_one_insert(self, supabase):
+        session_id, card_id = uuid.uuid4(), uuid.uuid4()
+        interactions = self._interactions(session_id, card_id)
+        service = StudySessionService(supabase)
+        rows = [
+            {"session_id": str(session_id), "user_id": "u", "card_id": str(card_id), "interaction_type": code,
+             "direction": None, "response_time": response_time}
+            for code, response_time in ((0, None), (1, 900))
+        ]
+        supabase.queue("card_interactions", data=_stored_rows(rows))
+
+        results = await service.record_card_interactions(interactions, uuid.uuid4())
+
+        [insert] = supabase.queries("card_interactions")
+        payload = insert.call("insert")[0][0]
+        assert [row["interaction_type"] for row in payload] == [0, 1]
+        assert [result.interaction_type for result in results] == ["flip", "quiz_correct"]
+        assert len(supabase.queries("user_card_progress")) == 2  # one select, one upsert
+
+    async def test_logs_when_progress_update_fails(self, supabase, caplog):
+        session_id, card_id = uuid.uuid4(), uuid.uuid4()
+        service = StudySessionService(supabase)
+        rows = [
+            {"session_id": str(session_id), "user_id": "u", "card_id": str(card_id), "interaction_type": 0,
+             "direction": None, "response_time": None}
+        ]
+        supabase.queue("card_interactions", data=_stored_rows(rows))
+        supabase.queue("user_card_progress", data=[])
+        supabase.queue("user_card_progress", error=RuntimeError("upsert failed"))
+
+        with caplog.at_level(logging.ERROR, logger="app.services.study_service"):
+            results = await service.record_card_interactions(self._interactions(session_id, card_id)[:1], uuid.uuid4())
+
+        assert len(results) == 1
+        assert "could not update their card progress" in caplog.text
+
+
+class TestGenerateQuizQuestion:
+    """Distractors are sampled from the (cached) deck card list"""
+
+    def _deck(self, size):
+        deck_id = uuid.uuid4()
+        cards = [
+            CardResponse(id=uuid.uuid4(), deck_id=deck_id, hanzi=f"字{i}", pinyin=f"zi{i}", english=f"word {i}", created_at=datetime(2024, 1, 1))
+            for i in range(size)
+        ]
+        deck_cards_cache.set(str(deck_id), cards)
+        return deck_id, cards
+
+    async def test_offers_three_distinct_distractors_and_the_answer(self, supabase):
+        deck_id, cards = self._deck(6)
+        service = StudySessionService(supabase)
+
+        for seed in range(50):
+            service._rng = random.Random(seed)
+            target = cards[seed % len(cards)]
+            question = await service.generate_quiz_question(target.id, deck_id, "chinese_to_english", uuid.uuid4())
+
+            assert target.hanzi in question.question
+            assert question.correct_answer == target.english
+            assert len(set(question.options)) == 4
+            assert question.options.count(target.english) == 1
+        assert not supabase.executed
+
+    async def test_small_deck_falls_back_to_a_single_option(self, supabase):
+        deck_id, cards = self._deck(3)
+        service = StudySessionService(supabase)
+
+        question = await service.generate_quiz_question(cards[0].id, deck_id, "english_to_chinese", uuid.uuid4())
+
+        assert question.options == [question.correct_answer] == ["字0 (zi0)"]